@@ -12,15 +12,15 @@ from datetime import datetime, timezone
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
 
 from utils.ea_api import (
-    fetch_json, warmup_session, HTTP_TIMEOUT, interpret_match_result,
+    fetch_json, warmup_session, interpret_match_result,
+    shared_session, close_shared_session,
 )
 from database import (
-    init_db, record_playoff_match, update_playoff_stats,
+    init_db, record_playoff_match, update_playoff_stats_bulk,
     set_last_playoff_match_id, count_playoff_matches,
     get_playoff_stats, get_playoff_club_stats,
     get_all_guild_settings,
 )
-import aiohttp
 
 
 async def backfill():
@@ -33,7 +33,7 @@ async def backfill():
         print("No guilds configured in database!")
         return
 
-    async with aiohttp.ClientSession(timeout=HTTP_TIMEOUT) as session:
+    async with shared_session() as session:
         await warmup_session(session)
 
         for (guild_id, club_id, platform, channel_id, last_match_id, autopost) in rows:
@@ -99,14 +99,16 @@ async def backfill():
                 # Update player stats
                 club_players = players_data.get(str(club_id), {})
                 player_names = []
+                playoff_rows = []
                 for pid, pdata in club_players.items():
                     if isinstance(pdata, dict):
                         pname = pdata.get("playername", "Unknown")
                         goals = int(pdata.get("goals", 0) or 0)
                         assists = int(pdata.get("assists", 0) or 0)
                         rating = float(pdata.get("rating", 0) or 0)
-                        update_playoff_stats(guild_id, pname, playoff_period, goals, assists, rating)
+                        playoff_rows.append((pname, goals, assists, rating))
                         player_names.append(pname)
+                update_playoff_stats_bulk(guild_id, playoff_period, playoff_rows)
 
                 print(f"  [{i+1}] {dt.strftime('%Y-%m-%d %H:%M')} | {result} {our_score}-{opp_score} vs {opp_name} | {', '.join(player_names)}")
 
@@ -133,5 +135,12 @@ async def backfill():
     print("\nDone.")
 
 
+async def main():
+    try:
+        await backfill()
+    finally:
+        await close_shared_session()
+
+
 if __name__ == "__main__":
-    asyncio.run(backfill())
+    asyncio.run(main())
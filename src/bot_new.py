@@ -64,10 +64,12 @@ Use these prefixes to quickly identify issues in the console logs.
 import io
 import os
 import re
+import itertools
+import threading
+from collections import OrderedDict
 import logging
 import asyncio
 import time
-import aiohttp
 import discord
 from discord import app_commands
 from dotenv import load_dotenv
@@ -77,7 +79,7 @@ from datetime import datetime, timezone
 # Import our modules
 from database import (
     init_db, get_settings, upsert_settings, set_last_match_id,
-    get_all_guild_settings, cache_club_members, get_cached_club_members,
+    get_polling_work_units, optimize_db, cache_club_members, get_cached_club_members,
     update_player_match_history, is_player_initialized, mark_player_initialized,
     get_player_hat_trick_count, get_player_assist_hat_trick_count,
     get_all_players_hat_trick_stats, set_last_playoff_match_id,
@@ -93,21 +95,24 @@ from achievements import (
 from playoffs import is_playoff_match, process_playoff_match, detect_playoff_period, calculate_player_of_playoffs, announce_player_of_playoffs
 from database import count_playoff_matches, get_playoff_stats, get_playoff_club_stats, get_tracked_playoff_match_ids, has_playoff_been_announced
 from monthly import (
-    process_league_match_monthly, check_month_rollover, detect_month_period
+    process_league_match_monthly, check_month_rollover, detect_month_period, bootstrap_monthly
 )
 from utils.ea_api import (
     platform_from_choice, parse_club_id_from_any, warmup_session,
-    fetch_club_info, fetch_latest_match, fetch_latest_playoff_match,
-    fetch_json, HTTP_TIMEOUT, EAApiForbiddenError,
-    fetch_all_matches, calculate_player_wld, interpret_match_result,
+    fetch_club_info, fetch_clubs_info_bulk, invalidate_club_info, fetch_latest_match, fetch_latest_playoff_match,
+    fetch_json, EAApiForbiddenError, shared_session, close_shared_session,
+    fetch_all_matches, calculate_player_wld, interpret_match_result, match_position,
+)
+from utils.embeds import (
+    build_match_embed, extract_match_players, utc_to_str, PaginatedEmbedView, MATCH_RESULT_STYLE,
 )
-from utils.embeds import build_match_embed, utc_to_str, PaginatedEmbedView
 
-# Set Matplotlib backend before any pyplot import so it works correctly
-# in a headless server environment and across repeated command invocations.
+# Charts are built on bare Figure objects rather than pyplot, whose global
+# figure manager is not thread-safe; this lets rendering run in a worker
+# thread.  Agg is still selected explicitly for the headless server.
 import matplotlib
 matplotlib.use("Agg")
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import matplotlib.ticker as mticker
 
 # ---------- logging ----------
@@ -126,6 +131,8 @@ GUILD_ID = os.getenv("GUILD_ID")  # optional for fast guild sync
 POLL_INTERVAL_SECONDS = 60
 EA_FORBIDDEN_COOLDOWN_SECONDS = 600
 MIN_CHART_DATA_POINTS = 2  # minimum match-history entries needed to render a chart
+CHART_CACHE_MAX = 64  # rendered player charts kept in memory, keyed by the data plotted
+OPTIMIZE_DB_EVERY_N_POLLS = 60  # refresh SQLite planner statistics roughly hourly
 
 
 # ---------- Bot Class ----------
@@ -136,6 +143,10 @@ class ProClubsBot(discord.Client):
         self.tree = app_commands.CommandTree(self)
         self._ea_forbidden_until: dict[int, float] = {}
 
+    async def close(self):
+        await close_shared_session()
+        await super().close()
+
     async def on_ready(self):
         logger.info(f"Logged in as {self.user} (id: {self.user.id})")
         
@@ -159,6 +170,13 @@ class ProClubsBot(discord.Client):
         """Background task to poll for new matches."""
         await self.wait_until_ready()
         logger.info("Match watch loop ready")
+        polls = 0
+
+        # Load month-rollover state for all guilds in one pass before the first poll
+        try:
+            bootstrap_monthly()
+        except Exception as e:
+            logger.error(f"[Monthly] Failed to bootstrap month rollover state: {e}", exc_info=True)
         
         while not self.is_closed():
             try:
@@ -166,6 +184,10 @@ class ProClubsBot(discord.Client):
             except Exception as e:
                 logger.error(f"Error in match watch loop: {e}", exc_info=True)
             
+            polls += 1
+            if polls % OPTIMIZE_DB_EVERY_N_POLLS == 0:
+                optimize_db()
+            
             await asyncio.sleep(POLL_INTERVAL_SECONDS)
 
     async def poll_once_all_guilds(self):
@@ -173,40 +195,56 @@ class ProClubsBot(discord.Client):
         Poll all configured guilds for new matches.
         This runs every POLL_INTERVAL_SECONDS (60s by default).
         """
-        # Fetch all guild settings from database
-        rows = get_all_guild_settings()
+        # Fetch settings for every autopost-enabled guild in one query
+        units = get_polling_work_units()
         
-        if not rows:
-            logger.info("No guild settings found for match polling")
+        if not units:
+            logger.info("No guilds with autopost enabled for match polling")
             return
         
-        logger.info(f"Polling {len(rows)} guild(s) for new matches")
+        logger.info(f"Polling {len(units)} guild(s) for new matches")
 
-        async with aiohttp.ClientSession(timeout=HTTP_TIMEOUT) as session:
+        async with shared_session() as session:
             # Warm up session: visit EA's site to get cookies/pass Cloudflare
             # This helps prevent 403 errors when making API calls
             logger.debug("Warming up session for EA API...")
             await warmup_session(session)
-            
+
+            # One /clubs/info request per platform for all polled clubs; the
+            # per-guild fetch_club_info() calls below are then cache hits
+            clubs_by_platform = {}
+            for unit in units:
+                if unit["club_id"] and unit["platform"] and self._ea_forbidden_until.get(int(unit["guild_id"]), 0.0) <= time.time():
+                    clubs_by_platform.setdefault(unit["platform"], []).append(unit["club_id"])
+            for platform, club_ids in clubs_by_platform.items():
+                if len(club_ids) < 2:
+                    continue
+                try:
+                    await fetch_clubs_info_bulk(session, platform, club_ids)
+                except Exception as e:
+                    # Non-fatal: each guild still fetches its own club info below
+                    logger.warning(f"Bulk club info fetch failed for {platform}: {e}")
+
             # Process each guild's settings
-            for (guild_id, club_id, platform, channel_id, last_match_id, autopost) in rows:
-                logger.info(f"Checking guild {guild_id}: club_id={club_id}, platform={platform}, channel_id={channel_id}, autopost={autopost}, last_match_id={last_match_id}")
+            for unit in units:
+                guild_id = unit["guild_id"]
+                club_id = unit["club_id"]
+                platform = unit["platform"]
+                channel_id = unit["channel_id"]
+                last_match_id = unit["last_match_id"]
+                logger.info(f"Checking guild {guild_id}: club_id={club_id}, platform={platform}, channel_id={channel_id}, last_match_id={last_match_id}")
                 
                 # Verify all required settings are present
-                # Check if autopost is enabled (explicitly check for 1, not just truthy)
+                # (autopost=1 is already filtered in the work-unit query)
                 if not club_id or not platform or not channel_id:
                     logger.warning(f"Guild {guild_id} missing required settings (club_id={club_id}, platform={platform}, channel_id={channel_id})")
                     continue
-                
-                if autopost != 1:
-                    logger.debug(f"Guild {guild_id} autopost is disabled (autopost={autopost}), skipping")
-                    continue
 
                 # Month rollover check (POTM announcement) - runs every poll cycle
                 # Must be outside the EA API try block so it is not skipped by
                 # `continue` statements that fire when no new match is detected.
                 try:
-                    await check_month_rollover(self, guild_id)
+                    await check_month_rollover(self, guild_id, unit)
                 except Exception as monthly_err:
                     logger.error(f"[Guild {guild_id}] [Monthly] Error checking month rollover: {monthly_err}", exc_info=True)
 
@@ -222,9 +260,8 @@ class ProClubsBot(discord.Client):
                 
                 # Playoff match check — runs every poll cycle, not skipped by league continue
                 try:
-                    settings = get_settings(guild_id)
                     tracked_playoff_ids = get_tracked_playoff_match_ids(guild_id)
-                    last_playoff_id = settings.get("last_playoff_match_id") if settings else None
+                    last_playoff_id = unit["last_playoff_match_id"]
 
                     playoff_matches = await fetch_all_matches(
                         session, platform, club_id, max_count=10, match_type="playoffMatch"
@@ -284,7 +321,7 @@ class ProClubsBot(discord.Client):
                                 process_league_match_monthly(guild_id, pm, club_id)
 
                                 # Process playoff stats
-                                await process_playoff_match(self, guild_id, pm, "playoffMatch", club_id)
+                                await process_playoff_match(self, guild_id, pm, "playoffMatch", club_id, unit)
                 except EAApiForbiddenError as e:
                     self._ea_forbidden_until[int(guild_id)] = time.time() + EA_FORBIDDEN_COOLDOWN_SECONDS
                     logger.error(
@@ -434,7 +471,7 @@ class ProClubsBot(discord.Client):
                             playoff_count = count_playoff_matches(guild_id, playoff_period)
                             if playoff_count > 0 and not has_playoff_been_announced(guild_id, playoff_period):
                                 logger.info(f"[Guild {guild_id}] [Playoffs] League match after {playoff_count} playoff matches — announcing summary")
-                                await announce_player_of_playoffs(self, guild_id, playoff_period)
+                                await announce_player_of_playoffs(self, guild_id, playoff_period, unit)
                         except Exception as playoff_announce_err:
                             logger.error(f"[Guild {guild_id}] [Playoffs] Error auto-announcing playoff summary: {playoff_announce_err}", exc_info=True)
                     
@@ -502,11 +539,9 @@ class ProClubsBot(discord.Client):
                                     match_assists = int(pdata.get("assists", 0) or 0)
                                     match_rating = float(pdata.get("rating", 0) or 0)
 
-                                    # Extract position played in this match
-                                    # Check various possible field names for position
-                                    position = (pdata.get("pos") or pdata.get("position") or
-                                               pdata.get("posSorted") or pdata.get("positionSorted") or
-                                               member.get("favoritePosition") or "Unknown")
+                                    # Extract position played in this match, falling back
+                                    # to the member's favourite position
+                                    position = match_position(pdata, member.get("favoritePosition") or "Unknown")
 
                                     # Debug logging for ANY position investigation
                                     if str(position).upper() == "ANY" or str(position) == "28":
@@ -538,26 +573,45 @@ class ProClubsBot(discord.Client):
 
 client = ProClubsBot()
 
+# Charts only change when a player's tracked history does, so repeat /player
+# and /statsovertime calls reuse the encoded PNG.  Guarded by a lock because
+# rendering runs in worker threads.
+_chart_cache: OrderedDict[tuple, bytes] = OrderedDict()  # (player, history rows) -> PNG bytes
+_chart_cache_lock = threading.Lock()
+
 
 def _generate_player_chart(player_name: str, history: list) -> tuple | None:
     """
     Render a goals/assists/rating-over-time chart for *player_name* using *history*.
 
-    Returns a ``(discord.File, filename)`` tuple, or ``None`` when there are
-    fewer than ``MIN_CHART_DATA_POINTS`` data-points.
+    CPU-bound and synchronous: call it through ``asyncio.to_thread`` so the
+    event loop keeps serving other commands while the PNG renders.
+
+    Returns a ``(png_bytes, filename)`` tuple, or ``None`` when there are
+    fewer than ``MIN_CHART_DATA_POINTS`` data-points.  Raw bytes are returned
+    so callers can wrap them in a fresh ``discord.File`` per send without
+    reading the encoded image back out of a buffer.
     """
     if len(history) < MIN_CHART_DATA_POINTS:
         return None
 
+    rows = tuple((m["goals"], m["assists"], m.get("rating", 0.0)) for m in history)
+    cache_key = (player_name, rows)
+    filename = f"{player_name}_stats.png"
+    with _chart_cache_lock:
+        png = _chart_cache.get(cache_key)
+        if png is not None:
+            _chart_cache.move_to_end(cache_key)
+            return png, filename
+
     match_nums = list(range(1, len(history) + 1))
-    goals = [m["goals"] for m in history]
-    assists = [m["assists"] for m in history]
-    ratings = [m.get("rating", 0.0) for m in history]
-    cum_gpg = [sum(goals[:i + 1]) / (i + 1) for i in range(len(goals))]
-    cum_apg = [sum(assists[:i + 1]) / (i + 1) for i in range(len(assists))]
-
-    has_ratings = any(r > 0 for r in ratings)
-    fig, axes = plt.subplots(3, 1, figsize=(10, 12), sharex=True)
+    goals, assists, ratings = zip(*rows)
+    cum_gpg = [total / n for n, total in zip(match_nums, itertools.accumulate(goals))]
+    cum_apg = [total / n for n, total in zip(match_nums, itertools.accumulate(assists))]
+
+    valid_ratings = [r for r in ratings if r > 0]
+    fig = Figure(figsize=(10, 12))
+    axes = fig.subplots(3, 1, sharex=True)
     ax1, ax2, ax3 = axes[0], axes[1], axes[2]
 
     fig.patch.set_facecolor("#2f3136")
@@ -585,9 +639,8 @@ def _generate_player_chart(player_name: str, history: list) -> tuple | None:
     ax2.legend(facecolor="#2f3136", labelcolor="white")
     ax2.yaxis.set_major_locator(mticker.MaxNLocator(integer=True))
 
-    if has_ratings:
-        valid_ratings = [r for r in ratings if r > 0]
-        avg_r = sum(valid_ratings) / len(valid_ratings) if valid_ratings else 0
+    if valid_ratings:
+        avg_r = sum(valid_ratings) / len(valid_ratings)
         ax3.plot(match_nums, ratings, color="#f1c40f", linewidth=2, marker="o",
                  markersize=4, label="Rating (match)")
         ax3.axhline(avg_r, color="#f39c12", linewidth=1.5, linestyle="--",
@@ -607,15 +660,22 @@ def _generate_player_chart(player_name: str, history: list) -> tuple | None:
     ax3.set_ylabel("Rating", color="white")
     ax3.set_title(f"Rating Over Time — {player_name}", color="white")
 
-    plt.tight_layout(pad=2.0)
+    fig.tight_layout(pad=2.0)
 
     buf = io.BytesIO()
-    plt.savefig(buf, format="png", dpi=120, facecolor=fig.get_facecolor())
-    plt.close(fig)
-    buf.seek(0)
+    # A lighter zlib level trades ~25% larger files for a cheaper encode;
+    # charts stay far below Discord's attachment limit either way.
+    fig.savefig(
+        buf, format="png", dpi=120, facecolor=fig.get_facecolor(),
+        pil_kwargs={"compress_level": 3},
+    )
 
-    filename = f"{player_name}_stats.png"
-    return discord.File(buf, filename=filename), filename
+    png = buf.getvalue()
+    with _chart_cache_lock:
+        _chart_cache[cache_key] = png
+        if len(_chart_cache) > CHART_CACHE_MAX:
+            _chart_cache.popitem(last=False)
+    return png, filename
 
 
 # ---------- Slash commands ----------
@@ -652,13 +712,15 @@ async def setclub(interaction: discord.Interaction, club: str, gen: app_commands
     logger.debug(f"[Command: setclub] Parsed club ID: {parsed_id}, platform: {platform}")
 
     try:
-        async with aiohttp.ClientSession(timeout=HTTP_TIMEOUT) as session:
+        async with shared_session() as session:
             # Warm up session before making API calls to reduce 403 errors
             logger.debug(f"[Command: setclub] Warming up session for EA API...")
             await warmup_session(session)
             
             # Verify the club exists by fetching its info from EA API
+            # (fresh, not a cached copy, so a renamed club shows its new name)
             logger.debug(f"[Command: setclub] Fetching club info for club {parsed_id}...")
+            invalidate_club_info(parsed_id)
             info, used_platform = await fetch_club_info(session, platform, parsed_id)
             
             # EA API returns different formats, normalize to dict
@@ -1000,7 +1062,7 @@ async def clubstats(interaction: discord.Interaction):
     logger.debug(f"[Command: clubstats] Fetching stats for club {club_id} on platform {platform}")
 
     try:
-        async with aiohttp.ClientSession(timeout=HTTP_TIMEOUT) as session:
+        async with shared_session() as session:
             await warmup_session(session)
 
             info, used_platform = await fetch_club_info(session, platform, club_id)
@@ -1015,10 +1077,19 @@ async def clubstats(interaction: discord.Interaction):
                 club_info = {}
             name = club_info.get("name", "Unknown Club")
 
-            overall_data = await fetch_json(
-                session,
-                "/clubs/overallStats",
-                {"clubIds": str(club_id), "platform": used_platform},
+            # Overall stats and member stats only depend on the resolved platform,
+            # so fetch them concurrently
+            overall_data, members_data = await asyncio.gather(
+                fetch_json(
+                    session,
+                    "/clubs/overallStats",
+                    {"clubIds": str(club_id), "platform": used_platform},
+                ),
+                fetch_json(
+                    session,
+                    "/members/stats",
+                    {"clubId": str(club_id), "platform": used_platform},
+                ),
             )
 
             if isinstance(overall_data, list):
@@ -1050,12 +1121,6 @@ async def clubstats(interaction: discord.Interaction):
             form_map = {"-1": "", "1": "W", "2": "L", "3": "D"}
             recent_form = "".join(form_map.get(str(stats.get(f"lastMatch{i}", "-1")), "") for i in range(5))
 
-            members_data = await fetch_json(
-                session,
-                "/members/stats",
-                {"clubId": str(club_id), "platform": used_platform},
-            )
-
             if isinstance(members_data, list):
                 members_list = members_data
             else:
@@ -1181,7 +1246,7 @@ async def playerstats(interaction: discord.Interaction, player_name: str):
     platform = st["platform"]
 
     try:
-        async with aiohttp.ClientSession(timeout=HTTP_TIMEOUT) as session:
+        async with shared_session() as session:
             await warmup_session(session)
 
             # Fetch club info for club name
@@ -1422,15 +1487,13 @@ async def playerstats(interaction: discord.Interaction, player_name: str):
             # Build stats-over-time embed (page 3) and pre-render the chart
             from database import get_player_match_history as _get_history
             history = _get_history(interaction.guild_id, name, limit=20)
-            chart_result = _generate_player_chart(name, history)
+            chart_result = await asyncio.to_thread(_generate_player_chart, name, history)
 
             chart_page_files: dict = {}
             if chart_result:
-                chart_file, chart_filename = chart_result
-                # Read bytes so the file can be recreated on demand (e.g. when
+                # Keep the bytes so the file can be recreated on demand (e.g. when
                 # the user navigates to the graph page after viewing other pages).
-                chart_file.fp.seek(0)
-                chart_raw_bytes = chart_file.fp.read()
+                chart_raw_bytes, chart_filename = chart_result
 
                 def _make_chart_file(raw=chart_raw_bytes, fname=chart_filename):
                     return discord.File(io.BytesIO(raw), filename=fname)
@@ -1507,7 +1570,7 @@ async def lastmatches(interaction: discord.Interaction, match_type: app_commands
         type_label = match_type.name
 
     try:
-        async with aiohttp.ClientSession(timeout=HTTP_TIMEOUT) as session:
+        async with shared_session() as session:
             await warmup_session(session)
             
             # Fetch club name
@@ -1530,12 +1593,12 @@ async def lastmatches(interaction: discord.Interaction, match_type: app_commands
                 return
             
             # Calculate summary stats across all fetched matches
+            our_key = str(club_id)
             total_w = total_d = total_l = total_gf = total_ga = 0
             for match in matches:
                 clubs_s = match.get("clubs", {})
-                oc = clubs_s.get(str(club_id), {})
-                opp_ids = [cid for cid in clubs_s.keys() if str(cid) != str(club_id)]
-                opc = clubs_s.get(opp_ids[0], {}) if opp_ids else {}
+                oc = clubs_s.get(our_key, {})
+                opc = next((c for k, c in clubs_s.items() if k != our_key), {})
                 r = interpret_match_result(oc)
                 if r == "W": total_w += 1
                 elif r == "L": total_l += 1
@@ -1547,30 +1610,23 @@ async def lastmatches(interaction: discord.Interaction, match_type: app_commands
 
             summary_line = f"W{total_w} D{total_d} L{total_l}  |  ⚽ {total_gf} scored, {total_ga} conceded"
 
-            # Build one page per match with full player breakdown
-            pages = []
+            # One page per match with full player breakdown, built when the
+            # page is first shown rather than all up front
             total_matches = len(matches)
-            for i, match in enumerate(matches, 1):
+
+            def build_page(index: int) -> discord.Embed:
+                i = index + 1
+                match = matches[index]
                 clubs = match.get("clubs", {})
-                our_club = clubs.get(str(club_id), {})
+                our_club = clubs.get(our_key, {})
 
-                opponent_id = [cid for cid in clubs.keys() if str(cid) != str(club_id)]
-                opponent_club = clubs.get(opponent_id[0], {}) if opponent_id else {}
+                opponent_club = next((c for k, c in clubs.items() if k != our_key), {})
                 opponent_name = opponent_club.get("details", {}).get("name", "Unknown")
 
                 our_score = our_club.get("score", "?")
                 opp_score = opponent_club.get("score", "?")
 
-                match_res = interpret_match_result(our_club)
-                if match_res == "W":
-                    result_emoji = "✅"
-                    color = 0x2ecc71
-                elif match_res == "L":
-                    result_emoji = "❌"
-                    color = 0xe74c3c
-                else:
-                    result_emoji = "🤝"
-                    color = 0xf1c40f
+                result_emoji, _, color = MATCH_RESULT_STYLE[interpret_match_result(our_club)]
 
                 time_ago = match.get("timeAgo", {})
                 time_str = (
@@ -1584,31 +1640,19 @@ async def lastmatches(interaction: discord.Interaction, match_type: app_commands
                     color=color,
                 )
 
-                # Player stats for this match
-                all_players = match.get("players", {})
-                club_players = all_players.get(str(club_id), {})
-                player_stats = []
-                for player_id, player_data in club_players.items():
-                    if isinstance(player_data, dict):
-                        player_stats.append({
-                            "name": player_data.get("playername", "Unknown"),
-                            "goals": int(player_data.get("goals", 0) or 0),
-                            "assists": int(player_data.get("assists", 0) or 0),
-                            "rating": float(player_data.get("rating", 0) or 0),
-                            "mom": int(player_data.get("mom", 0) or 0),
-                        })
-
-                # Sort by rating descending
-                player_stats.sort(key=lambda p: p["rating"], reverse=True)
+                # Player stats for this match, sorted by rating descending
+                player_stats = sorted(
+                    extract_match_players(match, club_id), key=lambda p: p.rating, reverse=True
+                )
 
                 if player_stats:
                     lines = []
                     for p in player_stats:
-                        motm_tag = " 🏅" if p["mom"] == 1 else ""
-                        g = f"⚽{p['goals']}" if p["goals"] > 0 else ""
-                        a = f"🅰️{p['assists']}" if p["assists"] > 0 else ""
+                        motm_tag = " 🏅" if p.mom == 1 else ""
+                        g = f"⚽{p.goals}" if p.goals > 0 else ""
+                        a = f"🅰️{p.assists}" if p.assists > 0 else ""
                         extras = " ".join(filter(None, [g, a]))
-                        line = f"**{p['name']}** — {p['rating']:.1f}{motm_tag}"
+                        line = f"**{p.name}** — {p.rating:.1f}{motm_tag}"
                         if extras:
                             line += f"  {extras}"
                         lines.append(line)
@@ -1621,10 +1665,10 @@ async def lastmatches(interaction: discord.Interaction, match_type: app_commands
                 embed.set_footer(
                     text=f"Match {i}/{total_matches} | {type_label} | {used_platform}"
                 )
-                pages.append(embed)
-            
-            view = PaginatedEmbedView(pages)
-            view.message = await interaction.followup.send(embed=pages[0], view=view, wait=True)
+                return embed
+
+            view = PaginatedEmbedView(build_page=build_page, page_count=total_matches)
+            view.message = await interaction.followup.send(embed=view.page(0), view=view, wait=True)
             
     except Exception as e:
         logger.error(f"Error fetching matches: {e}", exc_info=True)
@@ -1673,7 +1717,7 @@ async def leaderboard(
     use_month = period is not None and period.value == "month"
 
     try:
-        async with aiohttp.ClientSession(timeout=HTTP_TIMEOUT) as session:
+        async with shared_session() as session:
             await warmup_session(session)
 
             # Fetch club info
@@ -1999,7 +2043,7 @@ async def lastperformance(interaction: discord.Interaction, player_name: str, ma
         type_label = match_type.name
 
     try:
-        async with aiohttp.ClientSession(timeout=HTTP_TIMEOUT) as session:
+        async with shared_session() as session:
             await warmup_session(session)
 
             info, used_platform = await fetch_club_info(session, platform, club_id)
@@ -2149,7 +2193,7 @@ async def statsovertime(interaction: discord.Interaction, player_name: str):
 
         history = get_player_match_history(interaction.guild_id, player_name, limit=20)
 
-        chart_result = _generate_player_chart(player_name, history)
+        chart_result = await asyncio.to_thread(_generate_player_chart, player_name, history)
         if not chart_result:
             await interaction.followup.send(
                 f"❌ Not enough match history for **{player_name}** yet.\n"
@@ -2159,7 +2203,7 @@ async def statsovertime(interaction: discord.Interaction, player_name: str):
             )
             return
 
-        chart_file, chart_filename = chart_result
+        chart_raw_bytes, chart_filename = chart_result
         total_goals = sum(m["goals"] for m in history)
         total_assists = sum(m["assists"] for m in history)
         final_gpg = total_goals / len(history)
@@ -2176,6 +2220,7 @@ async def statsovertime(interaction: discord.Interaction, player_name: str):
         )
         embed.set_image(url=f"attachment://{chart_filename}")
         embed.set_footer(text="Match data tracked since the bot was set up for this server.")
+        chart_file = discord.File(io.BytesIO(chart_raw_bytes), filename=chart_filename)
         await interaction.followup.send(embed=embed, file=chart_file)
 
     except Exception as e:
@@ -2230,7 +2275,7 @@ async def bestxi(interaction: discord.Interaction, period: app_commands.Choice[s
         return "ANY"
 
     try:
-        async with aiohttp.ClientSession(timeout=HTTP_TIMEOUT) as session:
+        async with shared_session() as session:
             await warmup_session(session)
 
             info, used_platform = await fetch_club_info(session, platform, club_id)
@@ -2378,7 +2423,7 @@ async def headtohead(interaction: discord.Interaction, player1: str, player2: st
     platform = st["platform"]
 
     try:
-        async with aiohttp.ClientSession(timeout=HTTP_TIMEOUT) as session:
+        async with shared_session() as session:
             await warmup_session(session)
 
             info, used_platform = await fetch_club_info(session, platform, club_id)
@@ -34,12 +34,20 @@ DATABASE LOCATION:
 data/guild_settings.sqlite3 (relative to project root)
 This directory is used for Docker volume mounting.
 
+CONNECTION:
+-----------
+All helpers share one WAL-mode connection, serialized by a module lock.
+
 LOGGING:
 --------
 All database operations are logged with [Database] prefix for easy debugging.
 """
+import re
 import sqlite3
 import logging
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
@@ -50,173 +58,392 @@ DATA_DIR = Path(__file__).parent.parent / "data"
 DB_PATH = DATA_DIR / "guild_settings.sqlite3"
 
 
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    guild_id    INTEGER PRIMARY KEY,
+    club_id     INTEGER,
+    platform    TEXT,           -- common-gen5 / common-gen4
+    channel_id  INTEGER,        -- where new matches get posted
+    milestone_channel_id INTEGER, -- where milestones get posted
+    last_match_id TEXT,         -- last posted matchId
+    autopost    INTEGER DEFAULT 1,
+    updated_at  INTEGER NOT NULL  -- unix epoch seconds
+);
+
+CREATE TABLE IF NOT EXISTS player_milestones (
+    guild_id    INTEGER,
+    player_name TEXT,
+    milestone_type TEXT,        -- 'goals', 'assists', 'matches', 'motm'
+    milestone_value INTEGER,    -- e.g. 50 for "50 goals"
+    achieved_at INTEGER NOT NULL,  -- unix epoch seconds
+    PRIMARY KEY (guild_id, player_name, milestone_type, milestone_value)
+);
+
+CREATE TABLE IF NOT EXISTS club_members_cache (
+    guild_id    INTEGER,
+    player_name TEXT,
+    cached_at   INTEGER NOT NULL,  -- unix epoch seconds
+    PRIMARY KEY (guild_id, player_name)
+);
+
+CREATE TABLE IF NOT EXISTS player_achievements (
+    guild_id    INTEGER,
+    player_name TEXT,
+    achievement_id TEXT,        -- e.g. 'hat_trick_hero', 'perfect_10'
+    achieved_at INTEGER NOT NULL,  -- unix epoch seconds
+    PRIMARY KEY (guild_id, player_name, achievement_id)
+);
+
+CREATE TABLE IF NOT EXISTS player_match_history (
+    guild_id    INTEGER,
+    player_name TEXT,
+    match_id    TEXT,
+    goals       INTEGER DEFAULT 0,
+    assists     INTEGER DEFAULT 0,
+    clean_sheet INTEGER DEFAULT 0,  -- 1 if clean sheet, 0 otherwise
+    hat_trick   INTEGER DEFAULT 0,  -- 1 if 3+ goals in match, 0 otherwise
+    assist_hat_trick INTEGER DEFAULT 0,  -- 1 if 3+ assists in match, 0 otherwise
+    position    TEXT,               -- position played in that match (e.g. ST, CAM, ANY)
+    played_at   TEXT NOT NULL,
+    played_at_ms INTEGER,           -- unix epoch milliseconds, used for ordering/range scans
+    PRIMARY KEY (guild_id, player_name, match_id)
+);
+
+CREATE TABLE IF NOT EXISTS player_initialization (
+    guild_id    INTEGER,
+    player_name TEXT,
+    initialized_at TEXT NOT NULL,
+    PRIMARY KEY (guild_id, player_name)
+);
+
+CREATE TABLE IF NOT EXISTS playoff_stats (
+    guild_id    INTEGER,
+    player_name TEXT,
+    playoff_period TEXT,  -- YYYY-MM format for monthly tracking
+    goals       INTEGER DEFAULT 0,
+    assists     INTEGER DEFAULT 0,
+    total_rating REAL DEFAULT 0.0,
+    matches_played INTEGER DEFAULT 0,
+    playoff_score REAL GENERATED ALWAYS AS (
+        goals * 10 + assists * 10
+        + (CASE WHEN matches_played > 0 THEN total_rating / matches_played ELSE 0 END) * 5
+        + matches_played * 2
+    ) STORED,  -- Goals×10 + Assists×10 + Avg Rating×5 + Matches×2
+    updated_at  INTEGER NOT NULL,  -- unix epoch seconds
+    PRIMARY KEY (guild_id, player_name, playoff_period)
+);
+
+CREATE TABLE IF NOT EXISTS playoff_announcements (
+    guild_id    INTEGER,
+    playoff_period TEXT,  -- YYYY-MM format
+    announced_at TEXT NOT NULL,
+    PRIMARY KEY (guild_id, playoff_period)
+);
+
+CREATE TABLE IF NOT EXISTS playoff_club_stats (
+    guild_id    INTEGER,
+    playoff_period TEXT,  -- YYYY-MM format
+    match_id    TEXT,
+    result      TEXT,  -- W, L, D
+    goals_for   INTEGER DEFAULT 0,
+    goals_against INTEGER DEFAULT 0,
+    clean_sheet INTEGER DEFAULT 0,
+    played_at   TEXT NOT NULL,
+    PRIMARY KEY (guild_id, playoff_period, match_id)
+);
+
+CREATE TABLE IF NOT EXISTS monthly_stats (
+    guild_id    INTEGER,
+    player_name TEXT,
+    month_period TEXT,  -- YYYY-MM format
+    goals       INTEGER DEFAULT 0,
+    assists     INTEGER DEFAULT 0,
+    total_rating REAL DEFAULT 0.0,
+    matches_played INTEGER DEFAULT 0,
+    monthly_score REAL GENERATED ALWAYS AS (
+        goals * 10 + assists * 10
+        + (CASE WHEN matches_played > 0 THEN total_rating / matches_played ELSE 0 END) * 5
+        + matches_played * 2
+    ) STORED,  -- Goals×10 + Assists×10 + Avg Rating×5 + Matches×2
+    updated_at  INTEGER NOT NULL,  -- unix epoch seconds
+    PRIMARY KEY (guild_id, player_name, month_period)
+);
+
+CREATE TABLE IF NOT EXISTS monthly_announcements (
+    guild_id    INTEGER,
+    month_period TEXT,  -- YYYY-MM format
+    announced_at TEXT NOT NULL,
+    PRIMARY KEY (guild_id, month_period)
+);
+"""
+
+
+# Connection tuning. journal_mode=WAL is persistent and set once in init_db;
+# these apply per connection and are set when the shared connection opens.
+_CONNECTION_PRAGMAS = """
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-64000;
+PRAGMA mmap_size=268435456;
+PRAGMA busy_timeout=5000;
+"""
+
+
+_DB: sqlite3.Connection | None = None
+_DB_LOCK = threading.RLock()
+
+
+def _get_db() -> sqlite3.Connection:
+    """
+    Return the shared database connection, opening it on first use.
+    A single connection keeps SQLite's page cache warm across calls instead of
+    discarding it every time a helper runs.
+    """
+    global _DB
+    if _DB is None:
+        # A larger statement cache keeps every helper's SQL prepared on the shared connection
+        _DB = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=256)
+        # Rows index by position or column name, and dict(row) builds the dict in C
+        _DB.row_factory = sqlite3.Row
+        _DB.executescript(_CONNECTION_PRAGMAS)
+    return _DB
+
+
+@contextmanager
+def _connection():
+    """
+    Yield the shared connection while holding the module lock.
+    The connection's own context manager commits on success and rolls back
+    on error, the same as the old per-call `with sqlite3.connect(...)` blocks.
+    """
+    with _DB_LOCK:
+        db = _get_db()
+        with db:
+            yield db
+
+
+def _migrate_v1(db):
+    """
+    Schema v1: columns added after the initial release.
+    Databases created before user_version tracking may already have some of
+    these, so each column is checked before it is added.
+    """
+    columns = [row[1] for row in db.execute("PRAGMA table_info(settings)").fetchall()]
+    if "milestone_channel_id" not in columns:
+        db.execute("ALTER TABLE settings ADD COLUMN milestone_channel_id INTEGER")
+    if "achievement_channel_id" not in columns:
+        db.execute("ALTER TABLE settings ADD COLUMN achievement_channel_id INTEGER")
+    if "playoff_summary_channel_id" not in columns:
+        db.execute("ALTER TABLE settings ADD COLUMN playoff_summary_channel_id INTEGER")
+    if "last_playoff_match_id" not in columns:
+        db.execute("ALTER TABLE settings ADD COLUMN last_playoff_match_id TEXT")
+    if "monthly_channel_id" not in columns:
+        db.execute("ALTER TABLE settings ADD COLUMN monthly_channel_id INTEGER")
+
+    match_history_columns = [row[1] for row in db.execute("PRAGMA table_info(player_match_history)").fetchall()]
+    if "hat_trick" not in match_history_columns:
+        db.execute("ALTER TABLE player_match_history ADD COLUMN hat_trick INTEGER DEFAULT 0")
+    if "assist_hat_trick" not in match_history_columns:
+        db.execute("ALTER TABLE player_match_history ADD COLUMN assist_hat_trick INTEGER DEFAULT 0")
+    if "position" not in match_history_columns:
+        db.execute("ALTER TABLE player_match_history ADD COLUMN position TEXT")
+    if "result" not in match_history_columns:
+        db.execute("ALTER TABLE player_match_history ADD COLUMN result TEXT")
+    if "rating" not in match_history_columns:
+        db.execute("ALTER TABLE player_match_history ADD COLUMN rating REAL DEFAULT 0.0")
+
+
+def _migrate_v2(db):
+    """
+    Schema v2: INTEGER played_at_ms on player_match_history.
+    Backfilled from the ISO played_at text so existing history keeps its order.
+    """
+    match_history_columns = [row[1] for row in db.execute("PRAGMA table_info(player_match_history)").fetchall()]
+    if "played_at_ms" not in match_history_columns:
+        db.execute("ALTER TABLE player_match_history ADD COLUMN played_at_ms INTEGER")
+    db.execute(
+        """
+        UPDATE player_match_history
+        SET played_at_ms = CAST((julianday(played_at) - 2440587.5) * 86400000 AS INTEGER)
+        WHERE played_at_ms IS NULL
+        """
+    )
+
+
+def _migrate_v3(db):
+    """
+    Schema v3: secondary indexes for the hot read paths the primary keys don't cover.
+    - player_match_history: per-player history ordered / ranged by played_at_ms
+    - monthly_stats / playoff_stats: per-period leaderboards ordered by score
+    """
+    db.execute("CREATE INDEX IF NOT EXISTS idx_pmh_guild_player_played ON player_match_history(guild_id, player_name, played_at_ms)")
+    db.execute("CREATE INDEX IF NOT EXISTS idx_monthly_guild_period_score ON monthly_stats(guild_id, month_period, monthly_score)")
+    db.execute("CREATE INDEX IF NOT EXISTS idx_playoff_guild_period_score ON playoff_stats(guild_id, playoff_period, playoff_score)")
+
+
+# (table, column) pairs stored as unix epoch seconds since schema v4
+_EPOCH_COLUMNS = (
+    ("settings", "updated_at"),
+    ("player_milestones", "achieved_at"),
+    ("club_members_cache", "cached_at"),
+    ("player_achievements", "achieved_at"),
+    ("monthly_stats", "updated_at"),
+    ("playoff_stats", "updated_at"),
+)
+
+
+def _migrate_v4(db):
+    """
+    Schema v4: bookkeeping timestamps stored as INTEGER epoch seconds instead of ISO text.
+    SQLite can't change a column's type in place, so each legacy table is rebuilt
+    from its stored CREATE statement with the column retyped, and the ISO values
+    are converted on the way across. Tables created by _SCHEMA are already INTEGER.
+    """
+    for table, column in _EPOCH_COLUMNS:
+        column_types = {row[1]: row[2] for row in db.execute(f"PRAGMA table_info({table})").fetchall()}
+        if column_types.get(column, "").upper() == "INTEGER":
+            continue
+
+        create_sql = db.execute(
+            "SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table,)
+        ).fetchone()[0]
+        index_sqls = [
+            row[0] for row in db.execute(
+                "SELECT sql FROM sqlite_master WHERE type='index' AND tbl_name=? AND sql IS NOT NULL", (table,)
+            ).fetchall()
+        ]
+        new_sql = re.sub(rf"\b{column}(\s+)TEXT\b", rf"{column}\1INTEGER", create_sql, count=1)
+        new_sql = new_sql.replace(table, f"{table}_v4", 1)
+
+        db.execute(new_sql)
+        db.execute(f"INSERT INTO {table}_v4 SELECT * FROM {table}")
+        db.execute(
+            f"UPDATE {table}_v4 SET {column} = CAST(strftime('%s', {column}) AS INTEGER) "
+            f"WHERE typeof({column}) = 'text'"
+        )
+        db.execute(f"DROP TABLE {table}")
+        db.execute(f"ALTER TABLE {table}_v4 RENAME TO {table}")
+        for index_sql in index_sqls:
+            db.execute(index_sql)
+
+
+def _migrate_v5(db):
+    """Schema v5: settings.last_known_month so month-rollover detection survives restarts."""
+    columns = [row[1] for row in db.execute("PRAGMA table_info(settings)").fetchall()]
+    if "last_known_month" not in columns:
+        db.execute("ALTER TABLE settings ADD COLUMN last_known_month TEXT")
+
+
+def _migrate_v6(db):
+    """
+    Schema v6: monthly_score / playoff_score become STORED generated columns, so
+    SQLite derives the score from the row and writers never compute it.
+    A generated column can't be added to an existing table, so legacy tables are
+    rebuilt from the _SCHEMA definition and their base columns copied across.
+    """
+    copy_columns = "guild_id, player_name, {period}, goals, assists, total_rating, matches_played, updated_at"
+    for table, period, score in (
+        ("monthly_stats", "month_period", "monthly_score"),
+        ("playoff_stats", "playoff_period", "playoff_score"),
+    ):
+        # table_xinfo marks STORED generated columns with hidden=3
+        hidden = {row[1]: row[6] for row in db.execute(f"PRAGMA table_xinfo({table})").fetchall()}
+        if hidden.get(score) == 3:
+            continue
+
+        create_sql = re.search(rf"CREATE TABLE IF NOT EXISTS {table} \(.*?\n\);", _SCHEMA, re.S).group(0)
+        columns = copy_columns.format(period=period)
+        db.execute(f"ALTER TABLE {table} RENAME TO {table}_v5")
+        db.execute(create_sql)
+        db.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}_v5")
+        db.execute(f"DROP TABLE {table}_v5")
+    # The score indexes went with the old tables
+    _migrate_v3(db)
+
+
 def init_db():
     """Initialize database tables."""
     try:
         # Ensure data directory exists
         DATA_DIR.mkdir(parents=True, exist_ok=True)
         logger.info(f"Initializing database at: {DB_PATH.absolute()}")
-        with sqlite3.connect(DB_PATH) as db:
-            db.execute("""
-                CREATE TABLE IF NOT EXISTS settings (
-                    guild_id    INTEGER PRIMARY KEY,
-                    club_id     INTEGER,
-                    platform    TEXT,           -- common-gen5 / common-gen4
-                    channel_id  INTEGER,        -- where new matches get posted
-                    milestone_channel_id INTEGER, -- where milestones get posted
-                    last_match_id TEXT,         -- last posted matchId
-                    autopost    INTEGER DEFAULT 1,
-                    updated_at  TEXT NOT NULL
-                )
-            """)
-            db.execute("""
-                CREATE TABLE IF NOT EXISTS player_milestones (
-                    guild_id    INTEGER,
-                    player_name TEXT,
-                    milestone_type TEXT,        -- 'goals', 'assists', 'matches', 'motm'
-                    milestone_value INTEGER,    -- e.g. 50 for "50 goals"
-                    achieved_at TEXT NOT NULL,
-                    PRIMARY KEY (guild_id, player_name, milestone_type, milestone_value)
-                )
-            """)
-            db.execute("""
-                CREATE TABLE IF NOT EXISTS club_members_cache (
-                    guild_id    INTEGER,
-                    player_name TEXT,
-                    cached_at   TEXT NOT NULL,
-                    PRIMARY KEY (guild_id, player_name)
-                )
-            """)
-            db.execute("""
-                CREATE TABLE IF NOT EXISTS player_achievements (
-                    guild_id    INTEGER,
-                    player_name TEXT,
-                    achievement_id TEXT,        -- e.g. 'hat_trick_hero', 'perfect_10'
-                    achieved_at TEXT NOT NULL,
-                    PRIMARY KEY (guild_id, player_name, achievement_id)
-                )
-            """)
-            db.execute("""
-                CREATE TABLE IF NOT EXISTS player_match_history (
-                    guild_id    INTEGER,
-                    player_name TEXT,
-                    match_id    TEXT,
-                    goals       INTEGER DEFAULT 0,
-                    assists     INTEGER DEFAULT 0,
-                    clean_sheet INTEGER DEFAULT 0,  -- 1 if clean sheet, 0 otherwise
-                    hat_trick   INTEGER DEFAULT 0,  -- 1 if 3+ goals in match, 0 otherwise
-                    assist_hat_trick INTEGER DEFAULT 0,  -- 1 if 3+ assists in match, 0 otherwise
-                    position    TEXT,               -- position played in that match (e.g. ST, CAM, ANY)
-                    played_at   TEXT NOT NULL,
-                    PRIMARY KEY (guild_id, player_name, match_id)
-                )
-            """)
-            db.execute("""
-                CREATE TABLE IF NOT EXISTS player_initialization (
-                    guild_id    INTEGER,
-                    player_name TEXT,
-                    initialized_at TEXT NOT NULL,
-                    PRIMARY KEY (guild_id, player_name)
-                )
-            """)
-            db.execute("""
-                CREATE TABLE IF NOT EXISTS playoff_stats (
-                    guild_id    INTEGER,
-                    player_name TEXT,
-                    playoff_period TEXT,  -- YYYY-MM format for monthly tracking
-                    goals       INTEGER DEFAULT 0,
-                    assists     INTEGER DEFAULT 0,
-                    total_rating REAL DEFAULT 0.0,
-                    matches_played INTEGER DEFAULT 0,
-                    playoff_score REAL DEFAULT 0.0,
-                    updated_at  TEXT NOT NULL,
-                    PRIMARY KEY (guild_id, player_name, playoff_period)
-                )
-            """)
-            db.execute("""
-                CREATE TABLE IF NOT EXISTS playoff_announcements (
-                    guild_id    INTEGER,
-                    playoff_period TEXT,  -- YYYY-MM format
-                    announced_at TEXT NOT NULL,
-                    PRIMARY KEY (guild_id, playoff_period)
-                )
-            """)
-            db.execute("""
-                CREATE TABLE IF NOT EXISTS playoff_club_stats (
-                    guild_id    INTEGER,
-                    playoff_period TEXT,  -- YYYY-MM format
-                    match_id    TEXT,
-                    result      TEXT,  -- W, L, D
-                    goals_for   INTEGER DEFAULT 0,
-                    goals_against INTEGER DEFAULT 0,
-                    clean_sheet INTEGER DEFAULT 0,
-                    played_at   TEXT NOT NULL,
-                    PRIMARY KEY (guild_id, playoff_period, match_id)
-                )
-            """)
-            db.execute("""
-                CREATE TABLE IF NOT EXISTS monthly_stats (
-                    guild_id    INTEGER,
-                    player_name TEXT,
-                    month_period TEXT,  -- YYYY-MM format
-                    goals       INTEGER DEFAULT 0,
-                    assists     INTEGER DEFAULT 0,
-                    total_rating REAL DEFAULT 0.0,
-                    matches_played INTEGER DEFAULT 0,
-                    monthly_score REAL DEFAULT 0.0,
-                    updated_at  TEXT NOT NULL,
-                    PRIMARY KEY (guild_id, player_name, month_period)
-                )
-            """)
-            db.execute("""
-                CREATE TABLE IF NOT EXISTS monthly_announcements (
-                    guild_id    INTEGER,
-                    month_period TEXT,  -- YYYY-MM format
-                    announced_at TEXT NOT NULL,
-                    PRIMARY KEY (guild_id, month_period)
-                )
-            """)
-
-            # Migration: Add milestone_channel_id column if it doesn't exist
-            cursor = db.execute("PRAGMA table_info(settings)")
-            columns = [row[1] for row in cursor.fetchall()]
-            if "milestone_channel_id" not in columns:
-                db.execute("ALTER TABLE settings ADD COLUMN milestone_channel_id INTEGER")
-            
-            # Migration: Add achievement_channel_id column if it doesn't exist
-            if "achievement_channel_id" not in columns:
-                db.execute("ALTER TABLE settings ADD COLUMN achievement_channel_id INTEGER")
-            
-            # Migration: Add playoff_summary_channel_id column if it doesn't exist
-            if "playoff_summary_channel_id" not in columns:
-                db.execute("ALTER TABLE settings ADD COLUMN playoff_summary_channel_id INTEGER")
-            
-            # Migration: Add last_playoff_match_id column if it doesn't exist
-            if "last_playoff_match_id" not in columns:
-                db.execute("ALTER TABLE settings ADD COLUMN last_playoff_match_id TEXT")
-
-            # Migration: Add monthly_channel_id column if it doesn't exist
-            if "monthly_channel_id" not in columns:
-                db.execute("ALTER TABLE settings ADD COLUMN monthly_channel_id INTEGER")
-
-            # Migration: Add hat-trick columns to player_match_history if they don't exist
-            cursor = db.execute("PRAGMA table_info(player_match_history)")
-            match_history_columns = [row[1] for row in cursor.fetchall()]
-            if "hat_trick" not in match_history_columns:
-                db.execute("ALTER TABLE player_match_history ADD COLUMN hat_trick INTEGER DEFAULT 0")
-            if "assist_hat_trick" not in match_history_columns:
-                db.execute("ALTER TABLE player_match_history ADD COLUMN assist_hat_trick INTEGER DEFAULT 0")
-            if "position" not in match_history_columns:
-                db.execute("ALTER TABLE player_match_history ADD COLUMN position TEXT")
-            if "result" not in match_history_columns:
-                db.execute("ALTER TABLE player_match_history ADD COLUMN result TEXT")
-            if "rating" not in match_history_columns:
-                db.execute("ALTER TABLE player_match_history ADD COLUMN rating REAL DEFAULT 0.0")
+        with _connection() as db:
+            # WAL lets readers run alongside writers and halves fsyncs per commit.
+            # The mode is stored in the database file, so this only needs to run here.
+            db.execute("PRAGMA journal_mode=WAL")
+
+            # All DDL runs as one script inside a single transaction
+            db.executescript(f"BEGIN;\n{_SCHEMA}\nCOMMIT;")
+
+            # Migrations are gated on PRAGMA user_version so the PRAGMA
+            # table_info scans only run once, on databases that predate them.
+            version = db.execute("PRAGMA user_version").fetchone()[0]
+            if version < 1:
+                _migrate_v1(db)
+                db.execute("PRAGMA user_version=1")
+            if version < 2:
+                _migrate_v2(db)
+                db.execute("PRAGMA user_version=2")
+            if version < 3:
+                _migrate_v3(db)
+                db.execute("PRAGMA user_version=3")
+            if version < 4:
+                _migrate_v4(db)
+                db.execute("PRAGMA user_version=4")
+            if version < 5:
+                _migrate_v5(db)
+                db.execute("PRAGMA user_version=5")
+            if version < 6:
+                _migrate_v6(db)
+                db.execute("PRAGMA user_version=6")
+
+            _load_announced_milestones(db)
+            db.execute("PRAGMA optimize")
         return True
     except Exception as e:
         raise RuntimeError(f"Failed to initialize database: {e}") from e
 
 
+def optimize_db():
+    """
+    Run PRAGMA optimize so SQLite refreshes query-planner statistics.
+    Called periodically from the polling loop; cheap when nothing has changed.
+    """
+    try:
+        with _connection() as db:
+            db.execute("PRAGMA optimize")
+        logger.debug("[Database] PRAGMA optimize complete")
+    except Exception as e:
+        logger.warning(f"[Database] ⚠️ PRAGMA optimize failed: {e}")
+
+
+# Settings change at human timescales, so get_settings() serves rows from this
+# cache for SETTINGS_CACHE_TTL seconds. Every settings writer invalidates its guild.
+SETTINGS_CACHE_TTL = 60
+_SETTINGS_CACHE: dict[int, tuple[float, dict]] = {}
+
+
+# upsert_settings SQL per field-name tuple. Callers use a handful of field
+# sets, so each statement is built once and hits the connection's statement cache.
+_UPSERT_SETTINGS_SQL: dict[tuple[str, ...], str] = {}
+
+
+def _upsert_settings_sql(columns: tuple[str, ...]) -> str:
+    """Return the settings UPSERT statement for these columns, building it on first use."""
+    sql = _UPSERT_SETTINGS_SQL.get(columns)
+    if sql is None:
+        cols = ", ".join(columns)
+        qmarks = ", ".join("?" for _ in columns)
+        updates = ", ".join(f"{k}=excluded.{k}" for k in columns)
+        sql = f"""
+                INSERT INTO settings (guild_id, {cols})
+                VALUES (?, {qmarks})
+                ON CONFLICT(guild_id) DO UPDATE SET {updates}
+                """
+        _UPSERT_SETTINGS_SQL[columns] = sql
+    return sql
+
+
 def upsert_settings(guild_id: int, **fields):
     """
     Update or insert guild settings in the database.
@@ -226,24 +453,15 @@ def upsert_settings(guild_id: int, **fields):
         guild_id: Discord guild ID
         **fields: Any settings fields to update (club_id, platform, channel_id, etc.)
     """
-    fields["updated_at"] = datetime.utcnow().isoformat()
-    cols = ", ".join(fields.keys())
-    qmarks = ", ".join("?" for _ in fields)
-    updates = ", ".join(f"{k}=excluded.{k}" for k in fields)
+    fields["updated_at"] = int(time.time())
     
     logger.info(f"[Database] Upserting settings for guild {guild_id}: {fields}")
     
     try:
-        with sqlite3.connect(DB_PATH) as db:
-            db.execute(
-                f"""
-                INSERT INTO settings (guild_id, {cols})
-                VALUES (?, {qmarks})
-                ON CONFLICT(guild_id) DO UPDATE SET {updates}
-                """,
-                (guild_id, *fields.values()),
-            )
+        with _connection() as db:
+            db.execute(_upsert_settings_sql(tuple(fields)), (guild_id, *fields.values()))
             db.commit()
+        _SETTINGS_CACHE.pop(guild_id, None)
         
         logger.info(f"[Database] ✅ Successfully saved settings for guild {guild_id}")
     except Exception as e:
@@ -261,9 +479,12 @@ def get_settings(guild_id: int):
     Returns:
         Dictionary with guild settings or None if not found
     """
+    cached = _SETTINGS_CACHE.get(guild_id)
+    if cached and time.monotonic() - cached[0] < SETTINGS_CACHE_TTL:
+        return dict(cached[1])
     logger.debug(f"[Database] Fetching settings for guild {guild_id}")
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             cur = db.execute(
                 "SELECT guild_id, club_id, platform, channel_id, last_match_id, autopost, milestone_channel_id, achievement_channel_id, playoff_summary_channel_id, last_playoff_match_id, monthly_channel_id FROM settings WHERE guild_id=?",
                 (guild_id,),
@@ -272,10 +493,10 @@ def get_settings(guild_id: int):
             if not row:
                 logger.debug(f"[Database] No settings found for guild {guild_id}")
                 return None
-            keys = ["guild_id", "club_id", "platform", "channel_id", "last_match_id", "autopost", "milestone_channel_id", "achievement_channel_id", "playoff_summary_channel_id", "last_playoff_match_id", "monthly_channel_id"]
-            result = dict(zip(keys, row))
+            result = dict(row)
+            _SETTINGS_CACHE[guild_id] = (time.monotonic(), result)
             logger.debug(f"[Database] Retrieved settings for guild {guild_id}: club_id={result.get('club_id')}, platform={result.get('platform')}, autopost={result.get('autopost')}")
-            return result
+            return dict(result)
     except Exception as e:
         logger.error(f"[Database] ❌ Failed to get settings for guild {guild_id}: {e}", exc_info=True)
         raise
@@ -292,12 +513,13 @@ def set_last_match_id(guild_id: int, match_id: str):
     """
     logger.debug(f"[Database] Updating last_match_id for guild {guild_id} to {match_id}")
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             db.execute(
                 "UPDATE settings SET last_match_id=?, updated_at=? WHERE guild_id=?",
-                (match_id, datetime.utcnow().isoformat(), guild_id),
+                (match_id, int(time.time()), guild_id),
             )
             db.commit()
+        _SETTINGS_CACHE.pop(guild_id, None)
         logger.info(f"[Database] ✅ Updated last_match_id for guild {guild_id} to {match_id}")
     except Exception as e:
         logger.error(f"[Database] ❌ Failed to update last_match_id for guild {guild_id}: {e}", exc_info=True)
@@ -307,18 +529,18 @@ def set_last_match_id(guild_id: int, match_id: str):
 def get_all_guild_settings():
     """
     Get settings for all guilds configured in the database.
-    Used by the match polling loop to check all guilds for new matches.
+    Used by backfill_playoffs.py; the polling loop uses get_polling_work_units().
     
     Returns:
         List of tuples: (guild_id, club_id, platform, channel_id, last_match_id, autopost)
     """
     logger.debug("[Database] Fetching settings for all guilds")
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             cur = db.execute(
                 "SELECT guild_id, club_id, platform, channel_id, last_match_id, autopost FROM settings"
             )
-            rows = cur.fetchall()
+            rows = [tuple(row) for row in cur.fetchall()]
         logger.debug(f"[Database] Found {len(rows)} guild(s) in database")
         return rows
     except Exception as e:
@@ -326,10 +548,59 @@ def get_all_guild_settings():
         raise
 
 
+def get_polling_work_units() -> list[dict]:
+    """
+    Get everything the match polling loop needs for each autopost-enabled guild.
+    One query replaces get_all_guild_settings() plus a get_settings() call per guild.
+
+    Returns:
+        List of dicts with guild_id, club_id, platform, channel_id, last_match_id,
+        last_playoff_match_id, milestone_channel_id, achievement_channel_id,
+        monthly_channel_id, playoff_summary_channel_id
+    """
+    logger.debug("[Database] Fetching polling work units")
+    try:
+        with _connection() as db:
+            cur = db.execute(
+                """
+                SELECT guild_id, club_id, platform, channel_id, last_match_id,
+                       last_playoff_match_id, milestone_channel_id, achievement_channel_id,
+                       monthly_channel_id, playoff_summary_channel_id
+                FROM settings
+                WHERE autopost=1
+                """
+            )
+            units = [dict(row) for row in cur.fetchall()]
+        logger.debug(f"[Database] Found {len(units)} guild(s) with autopost enabled")
+        return units
+    except Exception as e:
+        logger.error(f"[Database] ❌ Failed to get polling work units: {e}", exc_info=True)
+        raise
+
+
+# Announced milestones keyed by (guild_id, player_name). Records are append-only,
+# so the whole table is loaded once by init_db() and record_milestone() writes
+# through to it. None means init_db() has not run and lookups go to SQLite.
+_announced_milestones: dict[tuple[int, str], set[tuple[str, int]]] | None = None
+
+
+def _load_announced_milestones(db):
+    """Load every recorded milestone into the in-process lookup map."""
+    global _announced_milestones
+    announced: dict[tuple[int, str], set[tuple[str, int]]] = {}
+    cur = db.execute("SELECT guild_id, player_name, milestone_type, milestone_value FROM player_milestones")
+    for guild_id, player_name, milestone_type, milestone_value in cur.fetchall():
+        announced.setdefault((guild_id, player_name), set()).add((milestone_type, milestone_value))
+    _announced_milestones = announced
+    logger.debug(f"[Database] Loaded announced milestones for {len(announced)} player(s)")
+
+
 def has_milestone_been_announced(guild_id: int, player_name: str, milestone_type: str, milestone_value: int) -> bool:
     """Check if a milestone has already been announced."""
+    if _announced_milestones is not None:
+        return (milestone_type, milestone_value) in _announced_milestones.get((guild_id, player_name), ())
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             cur = db.execute(
                 "SELECT 1 FROM player_milestones WHERE guild_id=? AND player_name=? AND milestone_type=? AND milestone_value=?",
                 (guild_id, player_name, milestone_type, milestone_value),
@@ -342,19 +613,42 @@ def has_milestone_been_announced(guild_id: int, player_name: str, milestone_type
         raise
 
 
+def get_announced_milestones(guild_id: int, player_name: str) -> set[tuple[str, int]]:
+    """
+    Get every milestone already announced for a player.
+    Returns a set of (milestone_type, milestone_value) pairs.
+    """
+    if _announced_milestones is not None:
+        return set(_announced_milestones.get((guild_id, player_name), ()))
+    try:
+        with _connection() as db:
+            cur = db.execute(
+                "SELECT milestone_type, milestone_value FROM player_milestones WHERE guild_id=? AND player_name=?",
+                (guild_id, player_name),
+            )
+            announced = {(row[0], row[1]) for row in cur.fetchall()}
+        logger.debug(f"[Database] Found {len(announced)} announced milestone(s) for {player_name}")
+        return announced
+    except Exception as e:
+        logger.error(f"[Database] ❌ Failed to get announced milestones: {e}", exc_info=True)
+        raise
+
+
 def record_milestone(guild_id: int, player_name: str, milestone_type: str, milestone_value: int):
     """Record that a milestone has been announced."""
     logger.debug(f"[Database] Recording milestone: guild={guild_id}, player={player_name}, type={milestone_type}, value={milestone_value}")
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             db.execute(
                 """
                 INSERT OR IGNORE INTO player_milestones (guild_id, player_name, milestone_type, milestone_value, achieved_at)
                 VALUES (?, ?, ?, ?, ?)
                 """,
-                (guild_id, player_name, milestone_type, milestone_value, datetime.utcnow().isoformat()),
+                (guild_id, player_name, milestone_type, milestone_value, int(time.time())),
             )
             db.commit()
+        if _announced_milestones is not None:
+            _announced_milestones.setdefault((guild_id, player_name), set()).add((milestone_type, milestone_value))
         logger.debug(f"[Database] ✅ Milestone recorded successfully")
     except Exception as e:
         logger.error(f"[Database] ❌ Failed to record milestone: {e}", exc_info=True)
@@ -372,16 +666,25 @@ def cache_club_members(guild_id: int, player_names: list[str]):
     """
     logger.debug(f"[Database] Caching {len(player_names)} player names for guild {guild_id}")
     try:
-        with sqlite3.connect(DB_PATH) as db:
-            # Clear old cache for this guild
-            db.execute("DELETE FROM club_members_cache WHERE guild_id=?", (guild_id,))
-            
-            # Insert new cache
-            now = datetime.utcnow().isoformat()
+        with _connection() as db:
+            # Upsert + prune run in one write transaction (one commit/fsync)
+            db.execute("BEGIN IMMEDIATE")
+            now = int(time.time())
             db.executemany(
-                "INSERT INTO club_members_cache (guild_id, player_name, cached_at) VALUES (?, ?, ?)",
+                """
+                INSERT INTO club_members_cache (guild_id, player_name, cached_at) VALUES (?, ?, ?)
+                ON CONFLICT(guild_id, player_name) DO UPDATE SET cached_at=excluded.cached_at
+                """,
                 [(guild_id, name, now) for name in player_names],
             )
+            # Players missing from this refresh have left the club. Pruned by
+            # name: two refreshes within one second share a cached_at value.
+            names = list(dict.fromkeys(player_names))
+            qmarks = ", ".join("?" for _ in names)
+            db.execute(
+                f"DELETE FROM club_members_cache WHERE guild_id=? AND player_name NOT IN ({qmarks})",
+                (guild_id, *names),
+            )
             db.commit()
         logger.debug(f"[Database] ✅ Cached player names for guild {guild_id}")
     except Exception as e:
@@ -391,7 +694,7 @@ def cache_club_members(guild_id: int, player_names: list[str]):
 
 def get_cached_club_members(guild_id: int) -> list[str]:
     """Get cached club member names for a guild."""
-    with sqlite3.connect(DB_PATH) as db:
+    with _connection() as db:
         cur = db.execute(
             "SELECT player_name FROM club_members_cache WHERE guild_id=? ORDER BY player_name",
             (guild_id,),
@@ -404,7 +707,7 @@ def get_cached_club_members(guild_id: int) -> list[str]:
 def has_achievement_been_earned(guild_id: int, player_name: str, achievement_id: str) -> bool:
     """Check if a player has already earned an achievement."""
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             cur = db.execute(
                 "SELECT 1 FROM player_achievements WHERE guild_id=? AND player_name=? AND achievement_id=?",
                 (guild_id, player_name, achievement_id),
@@ -421,13 +724,13 @@ def record_achievement(guild_id: int, player_name: str, achievement_id: str):
     """Record that a player has earned an achievement."""
     logger.debug(f"[Database] Recording achievement: guild={guild_id}, player={player_name}, achievement={achievement_id}")
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             db.execute(
                 """
                 INSERT OR IGNORE INTO player_achievements (guild_id, player_name, achievement_id, achieved_at)
                 VALUES (?, ?, ?, ?)
                 """,
-                (guild_id, player_name, achievement_id, datetime.utcnow().isoformat()),
+                (guild_id, player_name, achievement_id, int(time.time())),
             )
             db.commit()
         logger.debug(f"[Database] ✅ Achievement recorded successfully")
@@ -439,7 +742,7 @@ def record_achievement(guild_id: int, player_name: str, achievement_id: str):
 def get_player_achievement_history(guild_id: int, player_name: str) -> list[dict]:
     """Get all achievements earned by a player."""
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             cur = db.execute(
                 "SELECT achievement_id, achieved_at FROM player_achievements WHERE guild_id=? AND player_name=? ORDER BY achieved_at",
                 (guild_id, player_name),
@@ -454,13 +757,13 @@ def get_player_achievement_history(guild_id: int, player_name: str) -> list[dict
 def get_player_match_history(guild_id: int, player_name: str, limit: int = 20) -> list[dict]:
     """Get recent match history for a player (for streak tracking)."""
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             cur = db.execute(
                 """
                 SELECT match_id, goals, assists, clean_sheet, played_at, result, rating
                 FROM player_match_history
                 WHERE guild_id=? AND player_name=?
-                ORDER BY played_at DESC
+                ORDER BY played_at_ms DESC
                 LIMIT ?
                 """,
                 (guild_id, player_name, limit),
@@ -487,7 +790,7 @@ def get_player_match_history(guild_id: int, player_name: str, limit: int = 20) -
 def get_player_dominant_position(guild_id: int, player_name: str) -> str | None:
     """Get the most frequently played position from match history (excludes ANY/Unknown)."""
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             cur = db.execute(
                 """
                 SELECT position, COUNT(*) as cnt
@@ -511,7 +814,7 @@ def get_player_dominant_position(guild_id: int, player_name: str) -> str | None:
 def get_potm_history(guild_id: int, limit: int = 6) -> list[dict]:
     """Get the top scorer for each past month (for POTM history display)."""
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             cur = db.execute(
                 """
                 SELECT ms.month_period, ms.player_name, ms.monthly_score, ms.goals, ms.assists,
@@ -550,16 +853,15 @@ def get_potm_history(guild_id: int, limit: int = 6) -> list[dict]:
 def get_player_recent_goals_assists(guild_id: int, player_name: str, days: int = 7) -> dict:
     """Get goals + assists for a player in the last N days (for weekly trend)."""
     try:
-        from datetime import timedelta
-        cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
-        with sqlite3.connect(DB_PATH) as db:
+        cutoff_ms = int((time.time() - days * 86400) * 1000)
+        with _connection() as db:
             cur = db.execute(
                 """
                 SELECT COALESCE(SUM(goals), 0), COALESCE(SUM(assists), 0), COUNT(*)
                 FROM player_match_history
-                WHERE guild_id=? AND player_name=? AND played_at >= ?
+                WHERE guild_id=? AND player_name=? AND played_at_ms >= ?
                 """,
-                (guild_id, player_name, cutoff),
+                (guild_id, player_name, cutoff_ms),
             )
             row = cur.fetchone()
             return {"goals": row[0], "assists": row[1], "matches": row[2]}
@@ -581,14 +883,14 @@ def update_player_match_history(guild_id: int, player_name: str, match_id: str,
 
     logger.debug(f"[Database] Updating match history: player={player_name}, match={match_id}, goals={goals}, assists={assists}, position={position}, result={result}, rating={rating}, hat_trick={hat_trick}, assist_hat_trick={assist_hat_trick}")
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             db.execute(
                 """
                 INSERT OR REPLACE INTO player_match_history
-                (guild_id, player_name, match_id, goals, assists, clean_sheet, hat_trick, assist_hat_trick, position, result, rating, played_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                (guild_id, player_name, match_id, goals, assists, clean_sheet, hat_trick, assist_hat_trick, position, result, rating, played_at, played_at_ms)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (guild_id, player_name, match_id, goals, assists, 1 if clean_sheet else 0, hat_trick, assist_hat_trick, position, result, rating, datetime.utcnow().isoformat()),
+                (guild_id, player_name, match_id, goals, assists, 1 if clean_sheet else 0, hat_trick, assist_hat_trick, position, result, rating, datetime.utcnow().isoformat(), int(time.time() * 1000)),
             )
             db.commit()
         logger.debug(f"[Database] ✅ Match history updated successfully")
@@ -602,7 +904,7 @@ def update_player_match_history(guild_id: int, player_name: str, match_id: str,
 def is_player_initialized(guild_id: int, player_name: str) -> bool:
     """Check if a player has been initialized (historical achievements backfilled)."""
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             cur = db.execute(
                 "SELECT 1 FROM player_initialization WHERE guild_id=? AND player_name=?",
                 (guild_id, player_name),
@@ -619,7 +921,7 @@ def mark_player_initialized(guild_id: int, player_name: str):
     """Mark a player as initialized after historical achievements have been backfilled."""
     logger.debug(f"[Database] Marking player as initialized: guild={guild_id}, player={player_name}")
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             db.execute(
                 """
                 INSERT OR IGNORE INTO player_initialization (guild_id, player_name, initialized_at)
@@ -639,7 +941,7 @@ def mark_player_initialized(guild_id: int, player_name: str):
 def get_player_hat_trick_count(guild_id: int, player_name: str) -> int:
     """Get total number of hat-tricks (3+ goals in a match) for a player."""
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             cur = db.execute(
                 "SELECT COUNT(*) FROM player_match_history WHERE guild_id=? AND player_name=? AND hat_trick=1",
                 (guild_id, player_name),
@@ -654,7 +956,7 @@ def get_player_hat_trick_count(guild_id: int, player_name: str) -> int:
 def get_player_assist_hat_trick_count(guild_id: int, player_name: str) -> int:
     """Get total number of assist hat-tricks (3+ assists in a match) for a player."""
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             cur = db.execute(
                 "SELECT COUNT(*) FROM player_match_history WHERE guild_id=? AND player_name=? AND assist_hat_trick=1",
                 (guild_id, player_name),
@@ -672,7 +974,7 @@ def get_all_players_hat_trick_stats(guild_id: int) -> list[dict]:
     Returns list of dicts with player_name, hat_tricks, and assist_hat_tricks.
     """
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             cur = db.execute(
                 """
                 SELECT 
@@ -703,42 +1005,43 @@ def get_all_players_hat_trick_stats(guild_id: int) -> list[dict]:
 
 def update_playoff_stats(guild_id: int, player_name: str, playoff_period: str, goals: int, assists: int, rating: float):
     """Update playoff stats for a player in a specific playoff period."""
-    logger.debug(f"[Database] Updating playoff stats: player={player_name}, period={playoff_period}, goals={goals}, assists={assists}, rating={rating}")
+    update_playoff_stats_bulk(guild_id, playoff_period, [(player_name, goals, assists, rating)])
+
+
+def update_playoff_stats_bulk(guild_id: int, playoff_period: str, rows: list[tuple[str, int, int, float]]):
+    """
+    Add one playoff match worth of stats for several players in a single write transaction.
+
+    Args:
+        guild_id: Discord guild ID
+        playoff_period: Playoff period in YYYY-MM format
+        rows: (player_name, goals, assists, rating) per player
+    """
+    logger.debug(f"[Database] Updating playoff stats for {len(rows)} players: guild={guild_id}, period={playoff_period}")
+    if not rows:
+        return
     try:
-        with sqlite3.connect(DB_PATH) as db:
-            # Get current stats
-            cur = db.execute(
-                "SELECT goals, assists, total_rating, matches_played FROM playoff_stats WHERE guild_id=? AND player_name=? AND playoff_period=?",
-                (guild_id, player_name, playoff_period)
-            )
-            row = cur.fetchone()
-            
-            if row:
-                # Update existing record
-                current_goals, current_assists, current_total_rating, current_matches = row
-                new_goals = current_goals + goals
-                new_assists = current_assists + assists
-                new_total_rating = current_total_rating + rating
-                new_matches = current_matches + 1
-            else:
-                # Create new record
-                new_goals = goals
-                new_assists = assists
-                new_total_rating = rating
-                new_matches = 1
-            
-            # Calculate playoff score: (Goals × 10) + (Assists × 10) + (Average Rating × 5) + (Matches Played × 2)
-            avg_rating = new_total_rating / new_matches if new_matches > 0 else 0
-            playoff_score = (new_goals * 10) + (new_assists * 10) + (avg_rating * 5) + (new_matches * 2)
-            
-            # Insert or update
-            db.execute(
+        with _connection() as db:
+            db.execute("BEGIN IMMEDIATE")
+            now = int(time.time())
+            # playoff_score is a generated column, so only the base totals are written.
+            # In DO UPDATE the bare column names are the pre-update values.
+            db.executemany(
                 """
-                INSERT OR REPLACE INTO playoff_stats 
-                (guild_id, player_name, playoff_period, goals, assists, total_rating, matches_played, playoff_score, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO playoff_stats
+                (guild_id, player_name, playoff_period, goals, assists, total_rating, matches_played, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, 1, ?)
+                ON CONFLICT(guild_id, player_name, playoff_period) DO UPDATE SET
+                    goals = goals + excluded.goals,
+                    assists = assists + excluded.assists,
+                    total_rating = total_rating + excluded.total_rating,
+                    matches_played = matches_played + 1,
+                    updated_at = excluded.updated_at
                 """,
-                (guild_id, player_name, playoff_period, new_goals, new_assists, new_total_rating, new_matches, playoff_score, datetime.utcnow().isoformat())
+                [
+                    (guild_id, player_name, playoff_period, goals, assists, rating, now)
+                    for player_name, goals, assists, rating in rows
+                ],
             )
             db.commit()
         logger.debug(f"[Database] ✅ Playoff stats updated successfully")
@@ -747,18 +1050,24 @@ def update_playoff_stats(guild_id: int, player_name: str, playoff_period: str, g
         raise
 
 
-def get_playoff_stats(guild_id: int, playoff_period: str) -> list[dict]:
-    """Get all player playoff stats for a specific period."""
+def get_playoff_stats(guild_id: int, playoff_period: str, limit: int | None = None, min_matches: int = 0) -> list[dict]:
+    """
+    Get player playoff stats for a specific period.
+    limit caps the number of players returned (best first) and min_matches
+    drops players with fewer matches; both are applied in SQL so leaderboard
+    callers only materialize the rows they show.
+    """
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             cur = db.execute(
                 """
                 SELECT player_name, goals, assists, total_rating, matches_played, playoff_score
                 FROM playoff_stats 
-                WHERE guild_id=? AND playoff_period=?
+                WHERE guild_id=? AND playoff_period=? AND matches_played>=?
                 ORDER BY playoff_score DESC
+                LIMIT ?
                 """,
-                (guild_id, playoff_period)
+                (guild_id, playoff_period, min_matches, -1 if limit is None else limit)
             )
             rows = cur.fetchall()
             return [
@@ -778,15 +1087,24 @@ def get_playoff_stats(guild_id: int, playoff_period: str) -> list[dict]:
         return []
 
 
+# (guild_id, period) pairs known to be announced. Announcements are never
+# undone, so positive answers are cached for the life of the process.
+_playoff_announced: set[tuple[int, str]] = set()
+
+
 def has_playoff_been_announced(guild_id: int, playoff_period: str) -> bool:
     """Check if playoff summary has been announced for this period."""
+    if (guild_id, playoff_period) in _playoff_announced:
+        return True
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             cur = db.execute(
                 "SELECT 1 FROM playoff_announcements WHERE guild_id=? AND playoff_period=?",
                 (guild_id, playoff_period)
             )
             exists = cur.fetchone() is not None
+            if exists:
+                _playoff_announced.add((guild_id, playoff_period))
             logger.debug(f"[Database] Playoff announcement check: period={playoff_period} = {'already announced' if exists else 'NOT announced'}")
             return exists
     except Exception as e:
@@ -798,7 +1116,7 @@ def mark_playoff_announced(guild_id: int, playoff_period: str):
     """Mark that playoff summary has been announced for this period."""
     logger.debug(f"[Database] Marking playoff as announced: guild={guild_id}, period={playoff_period}")
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             db.execute(
                 """
                 INSERT OR IGNORE INTO playoff_announcements (guild_id, playoff_period, announced_at)
@@ -807,6 +1125,7 @@ def mark_playoff_announced(guild_id: int, playoff_period: str):
                 (guild_id, playoff_period, datetime.utcnow().isoformat())
             )
             db.commit()
+        _playoff_announced.add((guild_id, playoff_period))
         logger.debug(f"[Database] ✅ Playoff announcement marked")
     except Exception as e:
         logger.error(f"[Database] ❌ Failed to mark playoff announcement: {e}", exc_info=True)
@@ -816,7 +1135,7 @@ def mark_playoff_announced(guild_id: int, playoff_period: str):
 def count_playoff_matches(guild_id: int, playoff_period: str) -> int:
     """Count total playoff matches played in a period."""
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             cur = db.execute(
                 "SELECT COUNT(DISTINCT match_id) FROM playoff_club_stats WHERE guild_id=? AND playoff_period=?",
                 (guild_id, playoff_period)
@@ -832,7 +1151,7 @@ def record_playoff_match(guild_id: int, playoff_period: str, match_id: str, resu
     """Record a playoff match result for club statistics."""
     logger.debug(f"[Database] Recording playoff match: guild={guild_id}, period={playoff_period}, match={match_id}, result={result}")
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             db.execute(
                 """
                 INSERT OR IGNORE INTO playoff_club_stats 
@@ -851,7 +1170,7 @@ def record_playoff_match(guild_id: int, playoff_period: str, match_id: str, resu
 def get_tracked_playoff_match_ids(guild_id: int) -> set:
     """Return set of all playoff match IDs already tracked for a guild."""
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             cur = db.execute(
                 "SELECT DISTINCT match_id FROM playoff_club_stats WHERE guild_id=?",
                 (guild_id,)
@@ -865,7 +1184,7 @@ def get_tracked_playoff_match_ids(guild_id: int) -> set:
 def get_playoff_club_stats(guild_id: int, playoff_period: str) -> dict:
     """Get aggregated club statistics for a playoff period."""
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             cur = db.execute(
                 """
                 SELECT 
@@ -910,12 +1229,13 @@ def set_last_playoff_match_id(guild_id: int, match_id: str):
     """Update the last posted playoff match ID for a guild."""
     logger.debug(f"[Database] Updating last_playoff_match_id for guild {guild_id} to {match_id}")
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             db.execute(
                 "UPDATE settings SET last_playoff_match_id=?, updated_at=? WHERE guild_id=?",
-                (match_id, datetime.utcnow().isoformat(), guild_id),
+                (match_id, int(time.time()), guild_id),
             )
             db.commit()
+        _SETTINGS_CACHE.pop(guild_id, None)
         logger.info(f"[Database] ✅ Updated last_playoff_match_id for guild {guild_id} to {match_id}")
     except Exception as e:
         logger.error(f"[Database] ❌ Failed to update last_playoff_match_id for guild {guild_id}: {e}", exc_info=True)
@@ -926,37 +1246,43 @@ def set_last_playoff_match_id(guild_id: int, match_id: str):
 
 def update_monthly_stats(guild_id: int, player_name: str, month_period: str, goals: int, assists: int, rating: float):
     """Update monthly stats for a player in a specific month period."""
-    logger.debug(f"[Database] Updating monthly stats: player={player_name}, period={month_period}, goals={goals}, assists={assists}, rating={rating}")
-    try:
-        with sqlite3.connect(DB_PATH) as db:
-            cur = db.execute(
-                "SELECT goals, assists, total_rating, matches_played FROM monthly_stats WHERE guild_id=? AND player_name=? AND month_period=?",
-                (guild_id, player_name, month_period)
-            )
-            row = cur.fetchone()
+    update_monthly_stats_bulk(guild_id, month_period, [(player_name, goals, assists, rating)])
 
-            if row:
-                new_goals = row[0] + goals
-                new_assists = row[1] + assists
-                new_total_rating = row[2] + rating
-                new_matches = row[3] + 1
-            else:
-                new_goals = goals
-                new_assists = assists
-                new_total_rating = rating
-                new_matches = 1
-
-            # Score = (Goals x 10) + (Assists x 10) + (Avg Rating x 5) + (Matches Played x 2)
-            avg_rating = new_total_rating / new_matches if new_matches > 0 else 0
-            monthly_score = (new_goals * 10) + (new_assists * 10) + (avg_rating * 5) + (new_matches * 2)
 
-            db.execute(
+def update_monthly_stats_bulk(guild_id: int, month_period: str, rows: list[tuple[str, int, int, float]]):
+    """
+    Add one match worth of stats for several players in a single write transaction.
+
+    Args:
+        guild_id: Discord guild ID
+        month_period: Month in YYYY-MM format
+        rows: (player_name, goals, assists, rating) per player
+    """
+    logger.debug(f"[Database] Updating monthly stats for {len(rows)} players: guild={guild_id}, period={month_period}")
+    if not rows:
+        return
+    try:
+        with _connection() as db:
+            db.execute("BEGIN IMMEDIATE")
+            now = int(time.time())
+            # monthly_score is a generated column, so only the base totals are written.
+            # In DO UPDATE the bare column names are the pre-update values.
+            db.executemany(
                 """
-                INSERT OR REPLACE INTO monthly_stats
-                (guild_id, player_name, month_period, goals, assists, total_rating, matches_played, monthly_score, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO monthly_stats
+                (guild_id, player_name, month_period, goals, assists, total_rating, matches_played, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, 1, ?)
+                ON CONFLICT(guild_id, player_name, month_period) DO UPDATE SET
+                    goals = goals + excluded.goals,
+                    assists = assists + excluded.assists,
+                    total_rating = total_rating + excluded.total_rating,
+                    matches_played = matches_played + 1,
+                    updated_at = excluded.updated_at
                 """,
-                (guild_id, player_name, month_period, new_goals, new_assists, new_total_rating, new_matches, monthly_score, datetime.utcnow().isoformat())
+                [
+                    (guild_id, player_name, month_period, goals, assists, rating, now)
+                    for player_name, goals, assists, rating in rows
+                ],
             )
             db.commit()
         logger.debug(f"[Database] ✅ Monthly stats updated successfully")
@@ -965,18 +1291,52 @@ def update_monthly_stats(guild_id: int, player_name: str, month_period: str, goa
         raise
 
 
-def get_monthly_stats(guild_id: int, month_period: str) -> list[dict]:
-    """Get all player monthly stats for a specific period, sorted by score."""
+def get_last_known_months() -> dict[int, str]:
+    """
+    Get the last month period each guild's rollover check saw.
+    Returns {guild_id: "YYYY-MM"} for guilds that have one recorded.
+    """
+    try:
+        with _connection() as db:
+            cur = db.execute("SELECT guild_id, last_known_month FROM settings WHERE last_known_month IS NOT NULL")
+            months = {row[0]: row[1] for row in cur.fetchall()}
+        logger.debug(f"[Database] Loaded last known month for {len(months)} guild(s)")
+        return months
+    except Exception as e:
+        logger.error(f"[Database] ❌ Failed to get last known months: {e}", exc_info=True)
+        raise
+
+
+def set_last_known_month(guild_id: int, month_period: str):
+    """Record the month period the rollover check last saw for a guild."""
+    logger.debug(f"[Database] Updating last_known_month for guild {guild_id} to {month_period}")
+    try:
+        with _connection() as db:
+            db.execute("UPDATE settings SET last_known_month=? WHERE guild_id=?", (month_period, guild_id))
+            db.commit()
+    except Exception as e:
+        logger.error(f"[Database] ❌ Failed to update last_known_month for guild {guild_id}: {e}", exc_info=True)
+        raise
+
+
+def get_monthly_stats(guild_id: int, month_period: str, limit: int | None = None, min_matches: int = 0) -> list[dict]:
+    """
+    Get player monthly stats for a specific period, sorted by score.
+    limit caps the number of players returned (best first) and min_matches
+    drops players with fewer matches; both are applied in SQL so leaderboard
+    callers only materialize the rows they show.
+    """
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             cur = db.execute(
                 """
                 SELECT player_name, goals, assists, total_rating, matches_played, monthly_score
                 FROM monthly_stats
-                WHERE guild_id=? AND month_period=?
+                WHERE guild_id=? AND month_period=? AND matches_played>=?
                 ORDER BY monthly_score DESC
+                LIMIT ?
                 """,
-                (guild_id, month_period)
+                (guild_id, month_period, min_matches, -1 if limit is None else limit)
             )
             rows = cur.fetchall()
             return [
@@ -996,15 +1356,24 @@ def get_monthly_stats(guild_id: int, month_period: str) -> list[dict]:
         return []
 
 
+# (guild_id, period) pairs known to be announced. Announcements are never
+# undone, so positive answers are cached for the life of the process.
+_monthly_announced: set[tuple[int, str]] = set()
+
+
 def has_monthly_been_announced(guild_id: int, month_period: str) -> bool:
     """Check if monthly POTM has been announced for this period."""
+    if (guild_id, month_period) in _monthly_announced:
+        return True
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             cur = db.execute(
                 "SELECT 1 FROM monthly_announcements WHERE guild_id=? AND month_period=?",
                 (guild_id, month_period)
             )
             exists = cur.fetchone() is not None
+            if exists:
+                _monthly_announced.add((guild_id, month_period))
             logger.debug(f"[Database] Monthly announcement check: period={month_period} = {'already announced' if exists else 'NOT announced'}")
             return exists
     except Exception as e:
@@ -1016,7 +1385,7 @@ def mark_monthly_announced(guild_id: int, month_period: str):
     """Mark that monthly POTM has been announced for this period."""
     logger.debug(f"[Database] Marking monthly as announced: guild={guild_id}, period={month_period}")
     try:
-        with sqlite3.connect(DB_PATH) as db:
+        with _connection() as db:
             db.execute(
                 """
                 INSERT OR IGNORE INTO monthly_announcements (guild_id, month_period, announced_at)
@@ -1025,7 +1394,34 @@ def mark_monthly_announced(guild_id: int, month_period: str):
                 (guild_id, month_period, datetime.utcnow().isoformat())
             )
             db.commit()
+        _monthly_announced.add((guild_id, month_period))
         logger.debug(f"[Database] ✅ Monthly announcement marked")
     except Exception as e:
         logger.error(f"[Database] ❌ Failed to mark monthly announcement: {e}", exc_info=True)
         raise
+
+
+def get_unannounced_monthly_guilds(month_period: str) -> set[int]:
+    """
+    Get every guild that has monthly stats for month_period but no POTM
+    announcement for it. One query for all guilds, used at startup.
+    """
+    try:
+        with _connection() as db:
+            cur = db.execute(
+                """
+                SELECT DISTINCT ms.guild_id FROM monthly_stats ms
+                WHERE ms.month_period=?
+                  AND NOT EXISTS (
+                      SELECT 1 FROM monthly_announcements ma
+                      WHERE ma.guild_id=ms.guild_id AND ma.month_period=ms.month_period
+                  )
+                """,
+                (month_period,)
+            )
+            guilds = {row[0] for row in cur.fetchall()}
+        logger.debug(f"[Database] {len(guilds)} guild(s) with unannounced POTM for {month_period}")
+        return guilds
+    except Exception as e:
+        logger.error(f"[Database] ❌ Failed to get unannounced monthly guilds: {e}", exc_info=True)
+        raise
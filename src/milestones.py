@@ -2,9 +2,9 @@
 Milestone tracking and announcement logic.
 """
 import logging
-import discord
+from bisect import bisect_right
 from datetime import datetime, timezone
-from database import has_milestone_been_announced, record_milestone, get_settings
+from database import get_announced_milestones, record_milestone, get_settings
 
 logger = logging.getLogger('ProClubsBot.Milestones')
 
@@ -16,6 +16,34 @@ MILESTONE_THRESHOLDS = {
     "motm": [1, 5, 10, 25, 50, 100],
 }
 
+# Announcement tiers, highest first: (minimum value, progress bar, label).
+# The last entry has a 0 minimum so every milestone lands in a tier.
+_TIERS = (
+    (500, "🔶🔶🔶🔶🔶", "LEGENDARY"),
+    (250, "🟣🟣🟣🟣🟣", "EPIC"),
+    (100, "🟡🟡🟡🟡🟡", "ELITE"),
+    (50, "🔵🔵🔵🔵⬜", "IMPRESSIVE"),
+    (25, "🔵🔵🔵⬜⬜", "SOLID"),
+    (10, "🔵🔵⬜⬜⬜", "GROWING"),
+    (0, "🔵⬜⬜⬜⬜", "FIRST STEP"),
+)
+
+_MILESTONE_COLOR = 0xF1C40F  # discord.Color.gold()
+
+# Discord accepts at most 10 embeds in a single message
+MAX_EMBEDS_PER_MESSAGE = 10
+
+# (type, stats key, emoji, label, sorted thresholds) — built once at import
+_MILESTONE_TABLE = tuple(
+    (type_name, stat_key, emoji, label, tuple(sorted(MILESTONE_THRESHOLDS[type_name])))
+    for type_name, stat_key, emoji, label in (
+        ("goals", "goals", "⚽", "Goals"),
+        ("assists", "assists", "🅰️", "Assists"),
+        ("matches", "gamesPlayed", "🎮", "Matches Played"),
+        ("motm", "manOfTheMatch", "⭐", "Man of the Match"),
+    )
+)
+
 
 def check_milestones(guild_id: int, player_name: str, stats: dict) -> list[dict]:
     """
@@ -23,36 +51,27 @@ def check_milestones(guild_id: int, player_name: str, stats: dict) -> list[dict]
     Returns list of milestone dicts: [{"type": "goals", "value": 50, "emoji": "⚽", "label": "Goals"}, ...]
     """
     milestones = []
+    announced = None
     
-    # Goals
-    goals = int(stats.get("goals", 0) or 0)
-    for threshold in MILESTONE_THRESHOLDS["goals"]:
-        if goals >= threshold and not has_milestone_been_announced(guild_id, player_name, "goals", threshold):
-            milestones.append({"type": "goals", "value": threshold, "emoji": "⚽", "label": "Goals"})
-    
-    # Assists
-    assists = int(stats.get("assists", 0) or 0)
-    for threshold in MILESTONE_THRESHOLDS["assists"]:
-        if assists >= threshold and not has_milestone_been_announced(guild_id, player_name, "assists", threshold):
-            milestones.append({"type": "assists", "value": threshold, "emoji": "🅰️", "label": "Assists"})
-    
-    # Matches
-    matches = int(stats.get("gamesPlayed", 0) or 0)
-    for threshold in MILESTONE_THRESHOLDS["matches"]:
-        if matches >= threshold and not has_milestone_been_announced(guild_id, player_name, "matches", threshold):
-            milestones.append({"type": "matches", "value": threshold, "emoji": "🎮", "label": "Matches Played"})
-    
-    # Man of the Match
-    motm = int(stats.get("manOfTheMatch", 0) or 0)
-    for threshold in MILESTONE_THRESHOLDS["motm"]:
-        if motm >= threshold and not has_milestone_been_announced(guild_id, player_name, "motm", threshold):
-            milestones.append({"type": "motm", "value": threshold, "emoji": "⭐", "label": "Man of the Match"})
+    for type_name, stat_key, emoji, label, thresholds in _MILESTONE_TABLE:
+        value = int(stats.get(stat_key, 0) or 0)
+        # Most players sit below the first threshold in most categories
+        if value < thresholds[0]:
+            continue
+        if announced is None:
+            announced = get_announced_milestones(guild_id, player_name)
+        # Thresholds are sorted, so everything before the bisect point has been reached
+        for threshold in thresholds[:bisect_right(thresholds, value)]:
+            if (type_name, threshold) not in announced:
+                milestones.append({"type": type_name, "value": threshold, "emoji": emoji, "label": label})
     
     return milestones
 
 
 async def announce_milestones(client, guild_id: int, player_name: str, milestones: list[dict]):
     """Post milestone announcements to the configured channel."""
+    import discord  # deferred: only the announcement path needs discord.py
+
     if not milestones:
         return
     
@@ -65,33 +84,16 @@ async def announce_milestones(client, guild_id: int, player_name: str, milestone
         if not channel:
             return
         
+        embeds = []
         for milestone in milestones:
             # Record milestone FIRST to prevent duplicates
             record_milestone(guild_id, player_name, milestone["type"], milestone["value"])
 
             # Pick flavour text based on milestone size
             value = milestone["value"]
-            if value >= 500:
-                tier_bar = "🔶🔶🔶🔶🔶"
-                tier_label = "LEGENDARY"
-            elif value >= 250:
-                tier_bar = "🟣🟣🟣🟣🟣"
-                tier_label = "EPIC"
-            elif value >= 100:
-                tier_bar = "🟡🟡🟡🟡🟡"
-                tier_label = "ELITE"
-            elif value >= 50:
-                tier_bar = "🔵🔵🔵🔵⬜"
-                tier_label = "IMPRESSIVE"
-            elif value >= 25:
-                tier_bar = "🔵🔵🔵⬜⬜"
-                tier_label = "SOLID"
-            elif value >= 10:
-                tier_bar = "🔵🔵⬜⬜⬜"
-                tier_label = "GROWING"
-            else:
-                tier_bar = "🔵⬜⬜⬜⬜"
-                tier_label = "FIRST STEP"
+            for tier_min, tier_bar, tier_label in _TIERS:
+                if value >= tier_min:
+                    break
 
             embed = discord.Embed(
                 title=f"🏆 MILESTONE UNLOCKED — {tier_label}",
@@ -100,14 +102,25 @@ async def announce_milestones(client, guild_id: int, player_name: str, milestone
                     f"**{player_name}** has reached this milestone!\n\n"
                     f"{tier_bar}"
                 ),
-                color=discord.Color.gold(),
+                color=_MILESTONE_COLOR,
                 timestamp=datetime.now(timezone.utc),
             )
             embed.set_footer(text="Keep grinding — the next milestone awaits!")
 
-            await channel.send(embed=embed)
-            
-            logger.info(f"Announced milestone: {player_name} - {milestone['value']} {milestone['type']}")
+            embeds.append(embed)
+
+        # Batch the embeds into as few messages as Discord allows, sent one
+        # after another so the milestones arrive in threshold order
+        for start in range(0, len(embeds), MAX_EMBEDS_PER_MESSAGE):
+            batch = milestones[start:start + MAX_EMBEDS_PER_MESSAGE]
+            try:
+                await channel.send(embeds=embeds[start:start + MAX_EMBEDS_PER_MESSAGE])
+            except Exception as e:
+                for milestone in batch:
+                    logger.error(f"Failed to announce milestone {milestone['value']} {milestone['type']} for {player_name}: {e}")
+                continue
+            for milestone in batch:
+                logger.info(f"Announced milestone: {player_name} - {milestone['value']} {milestone['type']}")
     
     except Exception as e:
         logger.error(f"Failed to announce milestone: {e}", exc_info=True)
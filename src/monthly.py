@@ -11,34 +11,75 @@ Scoring Algorithm (same as playoffs):
 Score = (Goals x 10) + (Assists x 10) + (Avg Rating x 5) + (Matches Played x 2)
 """
 import logging
-import discord
+import time
 from datetime import datetime, timezone
 from database import (
     get_monthly_stats, has_monthly_been_announced, mark_monthly_announced,
-    get_settings, update_monthly_stats
+    get_settings, update_monthly_stats_bulk, get_last_known_months, set_last_known_month,
+    get_unannounced_monthly_guilds
 )
 
 logger = logging.getLogger('ProClubsBot.Monthly')
 
-# Track the last known month per guild to detect rollovers
-_last_known_month = {}
+# Track the last known month per guild to detect rollovers.
+# Loaded from settings.last_known_month by bootstrap_monthly() so a restart
+# doesn't look like a fresh start; None until then.
+_last_known_month: dict[int, str] | None = None
+
+# (previous month, guilds with unannounced stats for it), from bootstrap_monthly()
+_pending_potm: tuple[str, set[int]] | None = None
 
 # Minimum matches required to be eligible for Player of the Month
 MIN_MATCHES_FOR_POTM = 3
 
 
+# (epoch seconds of the next month boundary, "YYYY-MM") - the period is only
+# formatted again once that boundary has passed
+_cached_month_period: tuple[float, str] = (0.0, "")
+
+
+def _next_month_boundary(now: datetime) -> float:
+    """Return the epoch timestamp of midnight UTC on the first of the next month."""
+    year, month = (now.year + 1, 1) if now.month == 12 else (now.year, now.month + 1)
+    return datetime(year, month, 1, tzinfo=timezone.utc).timestamp()
+
+
 def detect_month_period() -> str:
     """Return the current month period in YYYY-MM format."""
-    now = datetime.now(timezone.utc)
-    return now.strftime("%Y-%m")
+    global _cached_month_period
+    if time.time() >= _cached_month_period[0]:
+        now = datetime.now(timezone.utc)
+        _cached_month_period = (_next_month_boundary(now), now.strftime("%Y-%m"))
+    return _cached_month_period[1]
+
+
+def previous_month_period(current_month: str | None = None) -> str:
+    """
+    Return the month before current_month (default: now) in YYYY-MM format.
+    Pure string arithmetic on the period; no datetime needed.
+    """
+    year, month = map(int, (current_month or detect_month_period()).split("-"))
+    if month == 1:
+        return f"{year - 1}-12"
+    return f"{year}-{month - 1:02d}"
 
 
-def previous_month_period() -> str:
-    """Return the previous month period in YYYY-MM format."""
-    now = datetime.now(timezone.utc)
-    if now.month == 1:
-        return f"{now.year - 1}-12"
-    return f"{now.year}-{now.month - 1:02d}"
+def bootstrap_monthly(current_month: str | None = None):
+    """
+    Load rollover state for every guild before the poll loop starts.
+    Two queries in total - the recorded months and the guilds whose previous
+    month was never announced - instead of a lookup pair per guild on the
+    first poll cycle after a restart.
+    """
+    global _last_known_month, _pending_potm
+    current_month = current_month or detect_month_period()
+    _last_known_month = get_last_known_months()
+    prev_month = previous_month_period(current_month)
+    _pending_potm = (prev_month, get_unannounced_monthly_guilds(prev_month))
+    logger.info(
+        f"[Monthly] Loaded last known month for {len(_last_known_month)} guild(s), "
+        f"{len(_pending_potm[1])} with unannounced POTM for {prev_month}"
+    )
 
 
 def process_league_match_monthly(guild_id: int, match_data: dict, club_id: int):
@@ -61,46 +102,52 @@ def process_league_match_monthly(guild_id: int, match_data: dict, club_id: int):
         players = match_data.get("players", {})
         club_players = players.get(str(club_id), {})
 
-        for player_id, player_data in club_players.items():
+        rows = []
+        for player_data in club_players.values():
             if isinstance(player_data, dict):
-                player_name = player_data.get("playername", "Unknown")
-                goals = int(player_data.get("goals", 0) or 0)
-                assists = int(player_data.get("assists", 0) or 0)
-                rating = float(player_data.get("rating", 0) or 0)
+                rows.append((
+                    player_data.get("playername", "Unknown"),
+                    int(player_data.get("goals", 0) or 0),
+                    int(player_data.get("assists", 0) or 0),
+                    float(player_data.get("rating", 0) or 0),
+                ))
 
-                update_monthly_stats(guild_id, player_name, month_period, goals, assists, rating)
+        update_monthly_stats_bulk(guild_id, month_period, rows)
 
         logger.info(f"[Monthly] Updated monthly stats for guild {guild_id}, period {month_period}")
     except Exception as e:
         logger.error(f"[Monthly] Failed to process league match for monthly stats: {e}", exc_info=True)
 
 
-async def announce_player_of_month(client, guild_id: int, month_period: str):
+async def announce_player_of_month(client, guild_id: int, month_period: str, settings: dict | None = None):
     """
     Announce the Player of the Month to the configured channel.
     Only announces if not already announced for this period.
     Requires at least MIN_MATCHES_FOR_POTM matches to be eligible.
+    settings may be passed by the poll loop; otherwise it is read from the DB.
     """
+    # deferred: only the announcement path needs discord.py
+    from utils.embeds import build_award_embed
+
     try:
         if has_monthly_been_announced(guild_id, month_period):
             logger.debug(f"[Monthly] POTM already announced for guild {guild_id}, period {month_period}")
             return
 
-        settings = get_settings(guild_id)
+        if settings is None:
+            settings = get_settings(guild_id)
         if not settings or not settings.get("monthly_channel_id"):
             logger.warning(f"[Monthly] No monthly channel configured for guild {guild_id}")
             return
 
-        all_stats = get_monthly_stats(guild_id, month_period)
-        if not all_stats:
-            logger.warning(f"[Monthly] No monthly stats found for guild {guild_id}, period {month_period}")
-            return
-
-        # Filter for players with enough matches to be eligible
-        eligible = [p for p in all_stats if p["matches_played"] >= MIN_MATCHES_FOR_POTM]
+        # Only the winner and two runners-up are shown, so fetch just those
+        eligible = get_monthly_stats(guild_id, month_period, limit=3, min_matches=MIN_MATCHES_FOR_POTM)
         if not eligible:
+            eligible = get_monthly_stats(guild_id, month_period, limit=3)
+            if not eligible:
+                logger.warning(f"[Monthly] No monthly stats found for guild {guild_id}, period {month_period}")
+                return
             logger.info(f"[Monthly] No players with {MIN_MATCHES_FOR_POTM}+ matches for {month_period}, using all players as fallback")
-            eligible = all_stats
 
         best_player = eligible[0]
 
@@ -109,53 +156,20 @@ async def announce_player_of_month(client, guild_id: int, month_period: str):
             logger.error(f"[Monthly] Could not find monthly channel {settings['monthly_channel_id']}")
             return
 
-        embed = discord.Embed(
+        embed = build_award_embed(
             title="🏅 Player of the Month",
             description=f"**{month_period}** Monthly Summary",
-            color=discord.Color.gold(),
-            timestamp=datetime.now(timezone.utc)
-        )
-
-        embed.add_field(
-            name="🥇 Player of the Month",
-            value=f"**{best_player['player_name']}**",
-            inline=False
-        )
-
-        embed.add_field(
-            name="Individual Performance",
-            value=f"⚽ **{best_player['goals']}** goals • 🅰️ **{best_player['assists']}** assists • ⭐ **{best_player['avg_rating']:.1f}** avg rating",
-            inline=False
+            award_name="🥇 Player of the Month",
+            player=best_player,
+            score_key="monthly_score",
+            score_label="⭐ Monthly Score",
+            footer="Score = Goals×10 + Assists×10 + Avg Rating×5 + Matches×2",
+            # Runners-up: 2nd and 3rd place only (winner already shown above)
+            ranking_name="🏅 Runners-up",
+            ranking=eligible[1:3],
+            ranking_medals=("🥈", "🥉"),
         )
 
-        embed.add_field(
-            name="🎮 Matches",
-            value=f"**{best_player['matches_played']}** matches played",
-            inline=True
-        )
-
-        embed.add_field(
-            name="⭐ Monthly Score",
-            value=f"**{best_player['monthly_score']:.1f}**",
-            inline=True
-        )
-
-        # Runners-up: 2nd and 3rd place only (winner already shown above)
-        runners_up = eligible[1:3]
-        if runners_up:
-            medals = ["🥈", "🥉"]
-            runners_up_text = ""
-            for i, player in enumerate(runners_up):
-                runners_up_text += f"{medals[i]} **{player['player_name']}** ({player['monthly_score']:.1f})\n"
-
-            embed.add_field(
-                name="🏅 Runners-up",
-                value=runners_up_text,
-                inline=False
-            )
-
-        embed.set_footer(text="Score = Goals×10 + Assists×10 + Avg Rating×5 + Matches×2")
-
         await channel.send(embed=embed)
         mark_monthly_announced(guild_id, month_period)
         logger.info(f"[Monthly] ✅ Player of the Month announced for guild {guild_id}, period {month_period}")
@@ -164,42 +178,58 @@ async def announce_player_of_month(client, guild_id: int, month_period: str):
         logger.error(f"[Monthly] Failed to announce Player of the Month: {e}", exc_info=True)
 
 
-async def check_month_rollover(client, guild_id: int):
+async def check_month_rollover(client, guild_id: int, settings: dict | None = None):
     """
     Check if the month has changed since last poll cycle.
     If so, announce POTM for the previous month (if any matches were played).
     Called each poll cycle from bot_new.py.
 
-    On the first poll cycle after a bot restart, also checks whether the
-    previous month has unannounced POTM stats (which could have been missed
-    if the bot was down during the month rollover).
+    The last seen month is persisted, so a rollover that happened while the
+    bot was down is still detected on restart. On the first poll after a
+    restart every guild also gets one check for unannounced POTM stats from
+    the previous month, which covers announcements that failed before the
+    restart. settings is handed on to announce_player_of_month.
     """
+    if _last_known_month is None:
+        bootstrap_monthly()
+
     current_month = detect_month_period()
     last_month = _last_known_month.get(guild_id)
-
-    if last_month is None:
-        # First poll cycle after bot start - record the current month
-        _last_known_month[guild_id] = current_month
-
-        # Check if the previous month had stats that were never announced
-        # (e.g., bot was down when the month rolled over)
-        prev_month = previous_month_period()
-        if not has_monthly_been_announced(guild_id, prev_month):
-            stats = get_monthly_stats(guild_id, prev_month)
-            if stats:
-                logger.info(f"[Monthly] Found unannounced POTM for {prev_month} after bot start, announcing now")
-                await announce_player_of_month(client, guild_id, prev_month)
+    # Hot path: same month as last poll and nothing left over from before a restart
+    if last_month == current_month and guild_id not in _pending_potm[1]:
         return
 
-    if current_month != last_month:
+    # Whatever happens below, this guild's restart check is used up
+    was_pending = guild_id in _pending_potm[1]
+    _pending_potm[1].discard(guild_id)
+
+    if last_month is not None and last_month != current_month:
         # Month has changed! Announce POTM for the previous month
         logger.info(f"[Monthly] Month rollover detected for guild {guild_id}: {last_month} -> {current_month}")
         _last_known_month[guild_id] = current_month
+        set_last_known_month(guild_id, current_month)
 
         prev_month = last_month
-        stats = get_monthly_stats(guild_id, prev_month)
-        if stats:
-            logger.info(f"[Monthly] Found {len(stats)} players with stats for {prev_month}, announcing POTM")
-            await announce_player_of_month(client, guild_id, prev_month)
+        if get_monthly_stats(guild_id, prev_month, limit=1):
+            logger.info(f"[Monthly] Found player stats for {prev_month}, announcing POTM")
+            await announce_player_of_month(client, guild_id, prev_month, settings)
         else:
             logger.debug(f"[Monthly] No stats found for previous month {prev_month}, skipping POTM announcement")
+        return
+
+    if last_month is None:
+        # First poll cycle for a guild with no recorded month - record the current month
+        _last_known_month[guild_id] = current_month
+        set_last_known_month(guild_id, current_month)
+
+    # Check if the previous month had stats that were never announced
+    # (e.g., bot was down when the month rolled over, or the announcement failed)
+    prev_month = previous_month_period(current_month)
+    if _pending_potm[0] == prev_month:
+        pending = was_pending
+    else:
+        # Bootstrapped for another month; ask the database directly
+        pending = not has_monthly_been_announced(guild_id, prev_month) and bool(get_monthly_stats(guild_id, prev_month, limit=1))
+    if pending:
+        logger.info(f"[Monthly] Found unannounced POTM for {prev_month} after bot start, announcing now")
+        await announce_player_of_month(client, guild_id, prev_month, settings)
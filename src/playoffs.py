@@ -7,26 +7,30 @@ This module handles:
 3. Calculating Player of the Playoffs using the scoring algorithm
 4. Announcing the results via /playoffsummary command
 """
+import re
 import logging
-import discord
-from datetime import datetime, timezone
 from database import (
     get_playoff_stats, has_playoff_been_announced, mark_playoff_announced,
     count_playoff_matches, get_settings, record_playoff_match, get_playoff_club_stats,
-    update_playoff_stats, update_player_match_history
+    update_playoff_stats_bulk, update_player_match_history
 )
-from utils.ea_api import interpret_match_result
+from monthly import detect_month_period
+from utils.ea_api import interpret_match_result, match_position
 
 logger = logging.getLogger('ProClubsBot.Playoffs')
 
+# Common playoff match type identifiers (may need adjustment based on actual API response).
+# "playoffMatch" is covered by "playoff"; one case-insensitive scan replaces a lower() plus four substring checks.
+_PLAYOFF_RE = re.compile(r"playoff|cup|tournament", re.IGNORECASE)
+
 
 def detect_playoff_period() -> str:
     """
     Determine the current playoff period (month) in YYYY-MM format.
     Playoffs typically occur at the end of each month.
     """
-    now = datetime.now(timezone.utc)
-    return now.strftime("%Y-%m")
+    # Same YYYY-MM period as the monthly tracker, which caches it until the next month boundary
+    return detect_month_period()
 
 
 def check_playoff_completion(guild_id: int, playoff_period: str) -> bool:
@@ -47,7 +51,7 @@ def calculate_player_of_playoffs(guild_id: int, playoff_period: str) -> dict | N
     Playoff Score = (Goals × 10) + (Assists × 10) + (Average Rating × 5) + (Matches Played × 2)
     """
     try:
-        stats = get_playoff_stats(guild_id, playoff_period)
+        stats = get_playoff_stats(guild_id, playoff_period, limit=1)
         if not stats:
             logger.debug(f"[Playoffs] No playoff stats found for guild {guild_id}, period {playoff_period}")
             return None
@@ -62,11 +66,15 @@ def calculate_player_of_playoffs(guild_id: int, playoff_period: str) -> dict | N
         return None
 
 
-async def announce_player_of_playoffs(client, guild_id: int, playoff_period: str):
+async def announce_player_of_playoffs(client, guild_id: int, playoff_period: str, settings: dict | None = None):
     """
     Announce the Player of the Playoffs to the configured channel.
     Only announces if not already announced for this period.
+    settings may be passed by the poll loop; otherwise it is read from the DB.
     """
+    # deferred: only the announcement path needs discord.py
+    from utils.embeds import build_award_embed
+
     try:
         # Check if already announced
         if has_playoff_been_announced(guild_id, playoff_period):
@@ -74,16 +82,19 @@ async def announce_player_of_playoffs(client, guild_id: int, playoff_period: str
             return
         
         # Get settings to find the playoff summary channel
-        settings = get_settings(guild_id)
+        if settings is None:
+            settings = get_settings(guild_id)
         if not settings or not settings.get("playoff_summary_channel_id"):
             logger.warning(f"[Playoffs] No playoff summary channel configured for guild {guild_id}")
             return
         
-        # Get the best player
-        best_player = calculate_player_of_playoffs(guild_id, playoff_period)
-        if not best_player:
+        # One query for the top three; the winner is the first row
+        top_players = get_playoff_stats(guild_id, playoff_period, limit=3)
+        if not top_players:
             logger.warning(f"[Playoffs] No playoff stats found for guild {guild_id}, period {playoff_period}")
             return
+        best_player = top_players[0]
+        logger.info(f"[Playoffs] Player of the Playoffs: {best_player['player_name']} with score {best_player['playoff_score']:.1f}")
         
         # Get the channel
         channel = client.get_channel(settings["playoff_summary_channel_id"])
@@ -94,15 +105,8 @@ async def announce_player_of_playoffs(client, guild_id: int, playoff_period: str
         # Get club statistics
         club_stats = get_playoff_club_stats(guild_id, playoff_period)
         
-        # Build the announcement embed
-        embed = discord.Embed(
-            title="🏆 Player of the Playoffs",
-            description=f"**{playoff_period}** Playoff Summary",
-            color=discord.Color.gold(),
-            timestamp=datetime.now(timezone.utc)
-        )
-        
-        # Add club performance stats if available
+        # Club performance leads the embed when available, then a spacer
+        lead_fields = []
         if club_stats:
             club_performance = (
                 f"**{club_stats['wins']}W - {club_stats['losses']}L - {club_stats['draws']}D** "
@@ -111,58 +115,27 @@ async def announce_player_of_playoffs(client, guild_id: int, playoff_period: str
                 f"(GD: **{club_stats['goal_difference']:+d}**)\n"
                 f"🧤 **{club_stats['clean_sheets']}** clean sheets"
             )
-            embed.add_field(
-                name=f"📊 Club Performance ({club_stats['total_matches']} matches)",
-                value=club_performance,
-                inline=False
-            )
-        
-        # Add separator
-        embed.add_field(name="\u200b", value="\u200b", inline=False)
-        
-        # Add the winner
-        embed.add_field(
-            name="🥇 Player of the Playoffs",
-            value=f"**{best_player['player_name']}**",
-            inline=False
-        )
-        
-        # Add detailed stats
-        embed.add_field(
-            name="Individual Performance",
-            value=f"⚽ **{best_player['goals']}** goals • 🅰️ **{best_player['assists']}** assists • ⭐ **{best_player['avg_rating']:.1f}** avg rating",
-            inline=False
-        )
-        
-        embed.add_field(
-            name="🎮 Matches",
-            value=f"**{best_player['matches_played']}** matches played",
-            inline=True
-        )
-        
-        embed.add_field(
-            name="⭐ Playoff Score",
-            value=f"**{best_player['playoff_score']:.1f}**",
-            inline=True
+            lead_fields.append({
+                "name": f"📊 Club Performance ({club_stats['total_matches']} matches)",
+                "value": club_performance,
+                "inline": False,
+            })
+        lead_fields.append({"name": "\u200b", "value": "\u200b", "inline": False})
+        
+        # Build the announcement embed; top 3 only if there are multiple players
+        embed = build_award_embed(
+            title="🏆 Player of the Playoffs",
+            description=f"**{playoff_period}** Playoff Summary",
+            award_name="🥇 Player of the Playoffs",
+            player=best_player,
+            score_key="playoff_score",
+            score_label="⭐ Playoff Score",
+            footer="Playoff performance calculated using: Goals×10 + Assists×10 + Avg Rating×5 + Matches×2",
+            ranking_name="🏅 Top Performers",
+            ranking=top_players if len(top_players) > 1 else None,
+            lead_fields=lead_fields,
         )
         
-        # Add top 3 if there are multiple players
-        all_stats = get_playoff_stats(guild_id, playoff_period)
-        if len(all_stats) > 1:
-            top_3_text = ""
-            medals = ["🥇", "🥈", "🥉"]
-            for i, player in enumerate(all_stats[:3]):
-                medal = medals[i] if i < 3 else f"{i+1}."
-                top_3_text += f"{medal} **{player['player_name']}** ({player['playoff_score']:.1f})\n"
-            
-            embed.add_field(
-                name="🏅 Top Performers",
-                value=top_3_text,
-                inline=False
-            )
-        
-        embed.set_footer(text="Playoff performance calculated using: Goals×10 + Assists×10 + Avg Rating×5 + Matches×2")
-        
         # Post the announcement
         await channel.send(embed=embed)
         
@@ -180,17 +153,11 @@ def is_playoff_match(match_type: str) -> bool:
     Determine if a match is a playoff match based on the match type.
     This may need to be updated based on how EA API identifies playoff matches.
     """
-    # Common playoff match type identifiers (may need adjustment based on actual API response)
-    playoff_indicators = ["playoff", "playoffMatch", "cup", "tournament"]
-    
-    if not match_type:
-        return False
-    
-    match_type_lower = match_type.lower()
-    return any(indicator in match_type_lower for indicator in playoff_indicators)
+    return bool(match_type) and _PLAYOFF_RE.search(match_type) is not None
 
 
-async def process_playoff_match(client, guild_id: int, match_data: dict, match_type: str, club_id: int):
+async def process_playoff_match(client, guild_id: int, match_data: dict, match_type: str, club_id: int,
+                                settings: dict | None = None):
     """
     Process a playoff match: update stats and check for completion.
     This should be called after a playoff match is detected and posted.
@@ -229,29 +196,30 @@ async def process_playoff_match(client, guild_id: int, match_data: dict, match_t
         
         # Update stats for each player
         club_players = players.get(str(club_id), {})
-        for player_id, player_data in club_players.items():
+        playoff_rows = []
+        for player_data in club_players.values():
             if isinstance(player_data, dict):
                 player_name = player_data.get("playername", "Unknown")
                 goals = int(player_data.get("goals", 0) or 0)
                 assists = int(player_data.get("assists", 0) or 0)
                 rating = float(player_data.get("rating", 0) or 0)
-                
-                # Update playoff player stats
-                update_playoff_stats(guild_id, player_name, playoff_period, goals, assists, rating)
+                playoff_rows.append((player_name, goals, assists, rating))
 
                 # Also update match history so playoff matches appear in /statsovertime
-                position = (player_data.get("pos") or player_data.get("position") or
-                           player_data.get("posSorted") or "Unknown")
+                position = match_position(player_data)
                 update_player_match_history(
                     guild_id, player_name, str(match_id),
                     goals, assists, clean_sheet, position, result,
                     rating=rating,
                 )
         
+        # Update playoff player stats for the whole roster in one transaction
+        update_playoff_stats_bulk(guild_id, playoff_period, playoff_rows)
+        
         # Check if playoffs are complete
         if check_playoff_completion(guild_id, playoff_period):
             logger.info(f"[Playoffs] Playoffs complete for guild {guild_id}, period {playoff_period}")
-            await announce_player_of_playoffs(client, guild_id, playoff_period)
+            await announce_player_of_playoffs(client, guild_id, playoff_period, settings)
         
     except Exception as e:
         logger.error(f"[Playoffs] Failed to process playoff match: {e}", exc_info=True)
@@ -6,6 +6,17 @@ from typing import Any, Dict, List, Optional
 import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential_jitter
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _JSONDecodeError: type[Exception] = orjson.JSONDecodeError
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    import json
+
+    _json_loads = json.loads
+    _JSONDecodeError = json.JSONDecodeError
+
 
 # NOTE: EA's Pro Clubs endpoints are undocumented and may change.
 # These endpoints are community-discovered and can break at any time.
@@ -13,10 +24,52 @@ from tenacity import retry, stop_after_attempt, wait_exponential_jitter
 BASE_URL = "https://proclubs.ea.com/api/fc/clubs"
 
 
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Referer": "https://www.ea.com/",
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Cache-Control": "no-cache",
+}
+
+# Idempotent endpoints that are revalidated with If-None-Match instead of refetched
+_CONDITIONAL_PATHS = frozenset({"matches", "info", "members"})
+
+DEFAULT_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=50, keepalive_expiry=60)
+
+
 class ProClubsApiError(RuntimeError):
     pass
 
 
+# One AsyncClient shared by every ProClubsClient that isn't handed its own,
+# so all guilds reuse the same pooled (HTTP/2 where available) connections.
+_shared_client: Optional[httpx.AsyncClient] = None
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        # Prefer HTTP/2 where possible; gracefully fall back if not available
+        try:
+            _shared_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(20.0), http2=True, limits=DEFAULT_LIMITS, headers=DEFAULT_HEADERS
+            )
+        except Exception:
+            # If http2 dependencies are missing, fall back to HTTP/1.1
+            _shared_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(20.0), limits=DEFAULT_LIMITS, headers=DEFAULT_HEADERS
+            )
+    return _shared_client
+
+
+async def close_shared_client() -> None:
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
+
+
 class ProClubsClient:
     def __init__(
         self,
@@ -28,40 +81,44 @@ class ProClubsClient:
         self.platform = platform.lower()
         self.region = region.lower()
         self.debug = debug
-        # Prefer HTTP/2 where possible; gracefully fall back if not available
-        if client is not None:
-            self._client = client
-        else:
-            try:
-                self._client = httpx.AsyncClient(timeout=httpx.Timeout(20.0), http2=True)
-            except Exception:
-                # If http2 dependencies are missing, fall back to HTTP/1.1
-                self._client = httpx.AsyncClient(timeout=httpx.Timeout(20.0))
+        # Without an explicit client, share the module-wide pooled one. A client
+        # passed in is still closed by aclose(), as before the shared pool.
+        self._close_on_aclose = client is not None
+        self._client = client if client is not None else get_shared_client()
+        # (path, sorted params) -> (ETag, parsed body) for conditional GETs
+        self._etag_cache: Dict[tuple, tuple[str, Any]] = {}
 
     async def aclose(self) -> None:
-        await self._client.aclose()
+        # The shared client outlives any one ProClubsClient; see close_shared_client()
+        if self._close_on_aclose:
+            await self._client.aclose()
 
     @retry(wait=wait_exponential_jitter(initial=1, max=10), stop=stop_after_attempt(3))
     async def _get(self, path: str, params: Dict[str, Any]) -> Any:
         url = f"{BASE_URL}/{path}"
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Referer": "https://www.ea.com/",
-            "Accept": "application/json, text/plain, */*",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Cache-Control": "no-cache",
-        }
+        cache_key = (path, tuple(sorted(params.items()))) if path in _CONDITIONAL_PATHS else None
+        cached = self._etag_cache.get(cache_key) if cache_key else None
+        headers = {**DEFAULT_HEADERS, "If-None-Match": cached[0]} if cached else DEFAULT_HEADERS
         try:
             if self.debug:
                 print(f"[ProClubsClient] GET {url} params={params}")
             r = await self._client.get(url, params=params, headers=headers)
             if self.debug:
                 print(f"[ProClubsClient] <- {r.status_code} {r.reason_phrase}")
+            if r.status_code == 304 and cached:
+                return cached[1]
             r.raise_for_status()
             # Some endpoints return plain text 'null' or ''
             try:
-                return r.json()
-            except Exception:
+                data = _json_loads(r.content)
+                if cache_key:
+                    etag = r.headers.get("ETag")
+                    if etag:
+                        self._etag_cache[cache_key] = (etag, data)
+                    else:
+                        self._etag_cache.pop(cache_key, None)
+                return data
+            except _JSONDecodeError:
                 text = r.text.strip()
                 if text and text.lower() != "null":
                     return text
@@ -99,6 +156,19 @@ class ProClubsClient:
         params: Dict[str, Any] = {"platform": self.platform, "clubIds": club_id}
         return await self._get("seasonalStats", params)
 
+    async def get_club_overview(self, club_id: str) -> Dict[str, Any]:
+        # The four lookups are independent, so issue them together over the shared
+        # connection. A failed lookup comes back as its ProClubsApiError instead of
+        # failing the others.
+        info, members, matches, season = await asyncio.gather(
+            self.get_club_info(club_id),
+            self.get_members(club_id),
+            self.get_match_history(club_id),
+            self.get_season_stats(club_id),
+            return_exceptions=True,
+        )
+        return {"info": info, "members": members, "matches": matches, "season": season}
+
     async def search_clubs_by_name(self, name: str) -> Any:
         # Path: /search?platform=<platform>&clubName=<name>
         params: Dict[str, Any] = {"platform": self.platform, "clubName": name}
@@ -113,6 +183,7 @@ async def example_usage() -> None:
         print(f"Club info: {info}")
     finally:
         await client.aclose()
+        await close_shared_client()
 
 
 if __name__ == "__main__":
@@ -1,75 +1,67 @@
 from __future__ import annotations
 
 import sqlite3
-import threading
 from typing import Any, Dict
 
 
-_LOCK = threading.Lock()
 _DB_PATH = "guild_settings.sqlite3"
 
 
-def _get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(_DB_PATH)
+def _open_connection() -> sqlite3.Connection:
+    conn = sqlite3.connect(_DB_PATH, check_same_thread=False, isolation_level=None)
     conn.row_factory = sqlite3.Row
+    conn.executescript("PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; PRAGMA temp_store=MEMORY;")
     return conn
 
 
+# One long-lived autocommit connection; every statement here is a single write or read.
+# No Python-side lock: CPython's sqlite3 is built threadsafe (serialized mode), WAL lets
+# readers run alongside the writer, and each write is one atomic UPSERT.
+_CONN = _open_connection()
+
+
 def _init_db() -> None:
-    with _get_connection() as conn:
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS guild_settings (
-                guild_id TEXT PRIMARY KEY,
-                club_id TEXT,
-                platform TEXT,
-                region TEXT,
-                pool TEXT,
-                channel_id INTEGER
-            )
-        """)
-        conn.commit()
+    _CONN.execute("""
+        CREATE TABLE IF NOT EXISTS guild_settings (
+            guild_id TEXT PRIMARY KEY,
+            club_id TEXT,
+            platform TEXT,
+            region TEXT,
+            pool TEXT,
+            channel_id INTEGER
+        )
+    """)
 
 
 _init_db()
 
+_COLUMNS = ("club_id", "platform", "region", "pool", "channel_id")
+
 
 def get_guild_settings(guild_id: int) -> Dict[str, Any]:
-    with _LOCK:
-        with _get_connection() as conn:
-            row = conn.execute(
-                "SELECT * FROM guild_settings WHERE guild_id = ?", (str(guild_id),)
-            ).fetchone()
-            if row:
-                return dict(row)
-            return {}
+    row = _CONN.execute(
+        "SELECT * FROM guild_settings WHERE guild_id = ?", (str(guild_id),)
+    ).fetchone()
+    if row:
+        return dict(row)
+    return {}
 
 
 def set_guild_settings(guild_id: int, updates: Dict[str, Any]) -> Dict[str, Any]:
-    with _LOCK:
-        with _get_connection() as conn:
-            current = get_guild_settings(guild_id)
-            current.update({k: v for k, v in updates.items() if v is not None})
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO guild_settings (guild_id, club_id, platform, region, pool, channel_id)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    str(guild_id),
-                    current.get("club_id"),
-                    current.get("platform"),
-                    current.get("region"),
-                    current.get("pool"),
-                    current.get("channel_id"),
-                ),
-            )
-            conn.commit()
-            return current
+    # Only the provided, non-None known columns are written, in one UPSERT, so
+    # concurrent updates to other columns are not clobbered.
+    cols = [k for k in _COLUMNS if updates.get(k) is not None]
+    assignments = ", ".join(f"{c}=excluded.{c}" for c in cols) or "guild_id=excluded.guild_id"
+    sql = (
+        f"INSERT INTO guild_settings (guild_id{''.join(', ' + c for c in cols)}) "
+        f"VALUES (?{', ?' * len(cols)}) "
+        f"ON CONFLICT(guild_id) DO UPDATE SET {assignments} RETURNING *"
+    )
+    row = _CONN.execute(sql, (str(guild_id), *[updates[c] for c in cols])).fetchone()
+    return dict(row)
 
 
 def all_guild_settings() -> Dict[str, Any]:
-    with _LOCK:
-        with _get_connection() as conn:
-            rows = conn.execute("SELECT * FROM guild_settings").fetchall()
-            return {row["guild_id"]: dict(row) for row in rows}
+    rows = _CONN.execute("SELECT * FROM guild_settings").fetchall()
+    return {row["guild_id"]: dict(row) for row in rows}
 
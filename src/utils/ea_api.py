@@ -15,11 +15,14 @@ KEY FEATURES:
    - Visits EA's HTML pages before API calls
    - Acquires cookies and passes Cloudflare/WAF checks
    - Significantly reduces 403 Forbidden errors
+   - With Playwright, the browser's cookies are sent with direct aiohttp
+     API calls; the browser is only the 403 fallback
 
 2. Retry Logic:
    - All API calls include automatic retry (default: 3 attempts)
-   - Exponential backoff with jitter for rate limiting
+   - Growing, randomized (decorrelated-jitter) backoff between attempts
    - Detailed error logging for debugging
+   - Circuit breaker pauses all requests briefly after repeated failures
 
 3. Platform Fallback:
    - Automatically tries other generation if first fails
@@ -54,12 +57,26 @@ COMMON ISSUES:
 """
 import re
 import os
+import copy
 import json
+import time
 import random
+import socket
 import logging
 import asyncio
+import functools
+import contextlib
+import email.utils
 from urllib.parse import urlencode
 import aiohttp
+from pathlib import Path
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    _json_loads = json.loads
 
 logger = logging.getLogger('ProClubsBot.EA_API')
 
@@ -85,8 +102,64 @@ HEADERS = {
 }
 
 HTTP_TIMEOUT = aiohttp.ClientTimeout(total=12, connect=5)
+# Per-request overrides of HTTP_TIMEOUT, see _request_timeout(). Club info is
+# tiny, so a hung request should give way to a retry/platform fallback fast;
+# long match histories get more room.
+CLUB_INFO_TIMEOUT = aiohttp.ClientTimeout(total=6, connect=4)
+LARGE_MATCHES_TIMEOUT = aiohttp.ClientTimeout(total=20, connect=5)
+
+# Connection pool for the shared session: keep EA connections alive between
+# polls and commands so calls don't pay a fresh TCP + TLS handshake.
+# enable_cleanup_closed aborts TLS connections the peer never finished closing.
+EA_CONNECTOR_LIMITS = {
+    "limit": 64, "limit_per_host": 16, "keepalive_timeout": 75, "ttl_dns_cache": 300,
+    "enable_cleanup_closed": True,
+}
+
+# Retry backoff, decorrelated jitter: each wait is drawn from
+# [BASE, 3 * previous wait] and capped, so waits grow on a persistent block
+# while concurrent clients drift apart instead of retrying in lockstep
+_RATE_LIMIT_STATUSES = (403, 429, 503)
+# Statuses that won't change on retry (bad params, unknown club/endpoint); fail
+# on the first one. 403 is not here: EA's WAF returns it transiently.
+_PERMANENT_STATUSES = (400, 401, 404, 410, 422)
+RETRY_BACKOFF_BASE = 0.5
+RETRY_BACKOFF_CAP = 30.0
+EA_MAX_ATTEMPTS = int(os.getenv("EA_MAX_ATTEMPTS", "3"))
+
+# Seconds a successful response is reused, by endpoint. Endpoints not listed
+# are never cached - notably /members/stats, which the poll loop reads right
+# after a new match to check milestones.
+_CACHE_TTLS = {"/clubs/info": 300, "/clubs/matches": 30, "/matches": 30}
+_RESPONSE_CACHE_MAX = 256
+
+# Club ID inside an EA club page URL, e.g. ...?clubId=12345&platform=...
+_CLUB_ID_RE = re.compile(r"[?&]clubId=(\d+)")
+
+# EA club result code -> "W"/"L"/"D", see interpret_match_result()
+_RESULT_CODES = {"1": "W", "2": "L", "3": "D", "4": "L"}
+
+# Field names EA has used for a player's position in match data, preferred first
+_POSITION_FIELDS = ("pos", "position", "posSorted", "positionSorted")
+
+# Match history endpoints, current first; EA has served both paths
+_MATCH_ENDPOINTS = ("/clubs/matches", "/matches")
 EA_USE_PLAYWRIGHT = os.getenv("EA_USE_PLAYWRIGHT", "1").lower() in ("1", "true", "yes", "on")
 EA_PLAYWRIGHT_TIMEOUT_MS = int(os.getenv("EA_PLAYWRIGHT_TIMEOUT_MS", "12000"))
+# How long cookies copied out of the browser are used before re-reading them;
+# Akamai's JS keeps rotating _abck in the background page
+EA_COOKIE_REFRESH_SECONDS = int(os.getenv("EA_COOKIE_REFRESH_SECONDS", "300"))
+# Browser profile (cookies, cache) kept on the data volume between restarts
+EA_PLAYWRIGHT_PROFILE_DIR = Path(os.getenv(
+    "EA_PLAYWRIGHT_PROFILE_DIR",
+    Path(__file__).resolve().parent.parent.parent / "data" / "ea_playwright_profile",
+))
+# Browser cookies are saved here so a restart can skip the Chromium warmup while
+# they're still accepted. data/ is the volume the database already lives on.
+EA_COOKIE_CACHE_PATH = Path(os.getenv(
+    "EA_COOKIE_CACHE_PATH",
+    Path(__file__).resolve().parent.parent.parent / "data" / "ea_cookies.json",
+))
 
 try:
     from playwright.async_api import async_playwright
@@ -95,10 +168,32 @@ except Exception:
     PLAYWRIGHT_AVAILABLE = False
 
 _pw = None
-_pw_browser = None
 _pw_context = None
 _pw_page = None  # Persistent page on EA domain for fetch() calls
 _pw_init_lock = None
+_ea_cookies: dict[str, str] = {}  # EA cookies (_abck, bm_sz, ...), sent as an explicit Cookie header
+_ea_cookies_loaded_at = 0.0
+_cookie_headers = None  # {"Cookie": ...} for _ea_cookies, see _set_ea_cookies(); HEADERS are session defaults
+_shared_session = None  # Process-wide aiohttp session, see get_shared_session()
+_response_cache: dict[tuple, tuple[float, object]] = {}  # (path, params) -> (fetched at, data)
+_inflight: dict[tuple, list] = {}  # requests in progress -> [shared task, callers that joined it]
+_match_endpoint_cache: dict[tuple[str, str], str] = {}  # (platform, club_id) -> endpoint that last returned matches
+
+# Upper bound on EA requests in flight at once, shared by every caller, so
+# fanning calls out with asyncio.gather can't turn into a burst at the WAF
+EA_CONCURRENCY = int(os.getenv("EA_CONCURRENCY", "8"))
+_ea_semaphore = None
+# Request pacing towards EA (requests per second, burst size); paces calls up
+# front instead of discovering the limit through 403/429 retries
+EA_RATE_PER_SECOND = float(os.getenv("EA_RATE_PER_SECOND", "5"))
+EA_RATE_BURST = int(os.getenv("EA_RATE_BURST", "10"))
+# Circuit breaker: after this many requests in a row have failed all their
+# attempts, new requests fail immediately for EA_CIRCUIT_OPEN_SECONDS instead
+# of each retrying into an EA outage (cached responses are still served)
+EA_CIRCUIT_FAILURES = int(os.getenv("EA_CIRCUIT_FAILURES", "10"))
+EA_CIRCUIT_OPEN_SECONDS = float(os.getenv("EA_CIRCUIT_OPEN_SECONDS", "30"))
+_circuit_failures = 0
+_circuit_open_until = 0.0  # monotonic time
 
 
 class EAApiForbiddenError(RuntimeError):
@@ -109,13 +204,49 @@ class EAApiForbiddenError(RuntimeError):
         self.path = path
 
 
+class EAApiCircuitOpenError(RuntimeError):
+    """Raised without a request while the EA API circuit breaker is open."""
+
+
 class EAApiHttpError(RuntimeError):
     """HTTP error for EA API requests across transports."""
 
-    def __init__(self, status: int, url: str, message: str):
+    def __init__(self, status: int, url: str, message: str, retry_after: float | None = None):
         super().__init__(message)
         self.status = status
         self.url = url
+        self.retry_after = retry_after  # seconds, from the Retry-After header if sent
+
+
+class _TokenBucket:
+    """
+    Token bucket: at most ``rate`` acquisitions per second on average, with
+    bursts of up to ``capacity``. acquire() waits until a token is available.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = None  # created on first use, inside the running loop
+
+    async def acquire(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+_EA_BUCKET = _TokenBucket(rate=EA_RATE_PER_SECOND, capacity=EA_RATE_BURST)
 
 
 def interpret_match_result(club_data: dict) -> str:
@@ -128,17 +259,19 @@ def interpret_match_result(club_data: dict) -> str:
 
     Returns "W", "L", or "D".
     """
-    result_code = str(club_data.get("result", ""))
-    winner_by_dnf = str(club_data.get("winnerByDnf", "0"))
-
-    if result_code == "1" or winner_by_dnf == "1":
+    if str(club_data.get("winnerByDnf", "0")) == "1":
         return "W"
-    elif result_code == "2" or result_code == "4":
-        return "L"
-    elif result_code == "3":
-        return "D"
-    else:
-        return "L"
+    # Unknown codes count as a loss
+    return _RESULT_CODES.get(str(club_data.get("result", "")), "L")
+
+
+def match_position(player_data: dict, default: str = "Unknown") -> str:
+    """Position a player played in a match, trying EA's different field names in order."""
+    for key in _POSITION_FIELDS:
+        value = player_data.get(key)
+        if value:
+            return value
+    return default
 
 
 def platform_from_choice(gen: str | None) -> str:
@@ -154,46 +287,131 @@ def parse_club_id_from_any(s: str) -> int | None:
     if not s:
         return None
     s = s.strip()
-    if s.isdigit():
+    # isdecimal, not isdigit: "²".isdigit() is True but int("²") raises
+    if s.isdecimal():
         return int(s)
-    m = re.search(r"[?&]clubId=(\d+)", s)
+    m = _CLUB_ID_RE.search(s)
     if m:
         return int(m.group(1))
     return None
 
 
+def _get_ea_semaphore() -> asyncio.Semaphore:
+    """Return the semaphore bounding concurrent EA requests (created on first use)."""
+    global _ea_semaphore
+    if _ea_semaphore is None:
+        _ea_semaphore = asyncio.Semaphore(EA_CONCURRENCY)
+    return _ea_semaphore
+
+
+def get_shared_session() -> aiohttp.ClientSession:
+    """Return the process-wide aiohttp session, creating it on first use."""
+    global _shared_session
+    if _shared_session is None or _shared_session.closed:
+        _shared_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(**EA_CONNECTOR_LIMITS),
+            timeout=HTTP_TIMEOUT,
+            headers=HEADERS,
+            # EA cookies go out as an explicit header (see _set_ea_cookies);
+            # Akamai rewrites _abck on most responses, and a shared jar would
+            # be filtered/updated by every concurrent request
+            cookie_jar=aiohttp.DummyCookieJar(),
+        )
+    return _shared_session
+
+
+@contextlib.asynccontextmanager
+async def shared_session():
+    """
+    ``async with`` form of get_shared_session(). Unlike
+    ``async with aiohttp.ClientSession()``, the session stays open on exit.
+    """
+    yield get_shared_session()
+
+
+async def close_shared_session():
+    """Close the shared session; call once on shutdown."""
+    global _shared_session
+    if _shared_session is not None:
+        await _shared_session.close()
+        _shared_session = None
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _compute_backoff(prev_sleep: float, retry_after: float | None = None) -> float:
+    """
+    Seconds to wait before the next attempt, given the previous wait.
+    EA's Retry-After wins when present; both are capped.
+    """
+    if retry_after is not None:
+        return min(RETRY_BACKOFF_CAP, retry_after)
+    return min(RETRY_BACKOFF_CAP, random.uniform(RETRY_BACKOFF_BASE, prev_sleep * 3))
+
+
 def _build_url(path: str, params: dict) -> str:
-    return f"{EA_BASE}{path}?{urlencode(params)}"
+    return _build_url_cached(path, tuple(sorted(params.items())))
 
 
-async def _ensure_playwright_page():
-    """Ensure a persistent Playwright page on the EA domain.
+@functools.lru_cache(maxsize=512)
+def _build_url_cached(path: str, items: tuple) -> str:
+    # Polling asks for the same club/params every cycle, so encode each once
+    return f"{EA_BASE}{path}?{urlencode(items)}"
 
-    Uses the system Chrome (channel="chrome") instead of bundled Chromium to
-    bypass Akamai bot detection. Keeps a persistent page open on the EA site
-    so that API calls can be made via fetch() with valid Akamai cookies.
+
+def _clear_foreign_profile_locks(profile_dir: Path):
     """
-    global _pw, _pw_browser, _pw_context, _pw_page, _pw_init_lock
-    if _pw_page is not None:
-        return _pw_page
+    Remove Chrome's Singleton* locks from *profile_dir* if another host left them.
 
-    if _pw_init_lock is None:
-        _pw_init_lock = asyncio.Lock()
+    SingletonLock is a symlink to "<hostname>-<pid>". Locks from a previous
+    container (different hostname) are never released and would make Chrome
+    refuse to open the profile. Locks from this host are left to Chrome, which
+    recovers them itself when their process is gone and otherwise keeps a
+    second instance out of a profile that is in use.
+    """
+    try:
+        target = os.readlink(profile_dir / "SingletonLock")
+    except OSError:
+        return  # no lock
+    lock_host = target.rpartition("-")[0]
+    if lock_host == socket.gethostname():
+        return
+    logger.info(f"[EA API] Removing browser profile locks left by host {lock_host!r}")
+    for lock in ("SingletonLock", "SingletonCookie", "SingletonSocket"):
+        (profile_dir / lock).unlink(missing_ok=True)
 
-    async with _pw_init_lock:
-        if _pw_page is not None:
-            return _pw_page
 
-        if not PLAYWRIGHT_AVAILABLE:
-            raise RuntimeError("Playwright is not installed")
+async def _launch_playwright_context():
+    """Start Playwright and launch the browser on the persistent EA profile.
 
+    A failed launch stops Playwright again, so retries don't leak drivers.
+    """
+    global _pw, _pw_context
+    try:
         _pw = await async_playwright().start()
 
         # Try system Chrome first (harder for Akamai to fingerprint),
-        # fall back to bundled Chromium if Chrome isn't installed
+        # fall back to bundled Chromium if Chrome isn't installed.
+        # A persistent profile keeps _abck and the HTTP cache across restarts,
+        # so a warm start can skip most of Akamai's JS challenge.
+        EA_PLAYWRIGHT_PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        _clear_foreign_profile_locks(EA_PLAYWRIGHT_PROFILE_DIR)
         for channel in ("chrome", None):
             try:
-                _pw_browser = await _pw.chromium.launch(
+                _pw_context = await _pw.chromium.launch_persistent_context(
+                    str(EA_PLAYWRIGHT_PROFILE_DIR),
                     headless=True,
                     channel=channel,
                     args=[
@@ -202,8 +420,13 @@ async def _ensure_playwright_page():
                         "--disable-http2",
                         "--disable-blink-features=AutomationControlled",
                     ],
+                    user_agent=HEADERS["User-Agent"],
+                    locale="en-US",
+                    extra_http_headers={
+                        "Referer": HEADERS["Referer"],
+                    },
                 )
-                logger.info(f"[EA API] Launched browser (channel={channel or 'bundled chromium'})")
+                logger.info(f"[EA API] Launched browser (channel={channel or 'bundled chromium'}, profile={EA_PLAYWRIGHT_PROFILE_DIR})")
                 break
             except Exception as e:
                 if channel is not None:
@@ -211,13 +434,6 @@ async def _ensure_playwright_page():
                     continue
                 raise
 
-        _pw_context = await _pw_browser.new_context(
-            user_agent=HEADERS["User-Agent"],
-            locale="en-US",
-            extra_http_headers={
-                "Referer": HEADERS["Referer"],
-            },
-        )
         # Hide automation indicators from Akamai bot detection
         await _pw_context.add_init_script("""
             Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
@@ -225,10 +441,81 @@ async def _ensure_playwright_page():
             delete window.cdc_adoQpoasnfa76pfcZLmcfl_Array;
             delete window.cdc_adoQpoasnfa76pfcZLmcfl_Promise;
             delete window.cdc_adoQpoasnfa76pfcZLmcfl_Symbol;
+
+            // API fetch helper used by _get_json_playwright, installed once per
+            // page so each call only sends the URL across
+            window.eaFetch = async (url) => {
+                const resp = await fetch(url, {
+                    method: 'GET',
+                    credentials: 'include',
+                    headers: { 'Accept': 'application/json, text/plain, */*' }
+                });
+                return {
+                    status: resp.status,
+                    retryAfter: resp.headers.get('Retry-After'),
+                    body: await resp.text(),
+                };
+            };
         """)
+    except BaseException:
+        await _close_playwright()
+        raise
+
+
+async def _close_playwright():
+    """Close the browser context and stop Playwright (best effort)."""
+    global _pw, _pw_context
+    if _pw_context is not None:
+        try:
+            await _pw_context.close()
+        except Exception as e:
+            logger.debug(f"[EA API] Closing browser context failed: {e}")
+        _pw_context = None
+    if _pw is not None:
+        try:
+            await _pw.stop()
+        except Exception as e:
+            logger.debug(f"[EA API] Stopping Playwright failed: {e}")
+        _pw = None
+
+
+async def _ensure_playwright_page():
+    """Ensure a persistent Playwright page on the EA domain.
+
+    Uses the system Chrome (channel="chrome") instead of bundled Chromium to
+    bypass Akamai bot detection. Keeps a persistent page open on the EA site
+    so that API calls can be made via fetch() with valid Akamai cookies.
+    """
+    global _pw_page, _pw_init_lock
+    if _pw_page is not None:
+        return _pw_page
+
+    if _pw_init_lock is None:
+        _pw_init_lock = asyncio.Lock()
+
+    async with _pw_init_lock:
+        if _pw_page is not None:
+            return _pw_page
+
+        if not PLAYWRIGHT_AVAILABLE:
+            raise RuntimeError("Playwright is not installed")
+
+        page = None
+        if _pw_context is not None:
+            # Only the page was reset: open a new one in the running browser,
+            # which still holds the profile, rather than launching a second
+            # browser on it
+            try:
+                page = await _pw_context.new_page()
+            except Exception as e:
+                logger.warning(f"[EA API] Browser context unusable, relaunching: {e}")
+                await _close_playwright()
+        if page is None:
+            await _launch_playwright_context()
+            page = await _pw_context.new_page()
 
         # Navigate to EA site — Akamai will run its bot detection JS and set cookies
-        _pw_page = await _pw_context.new_page()
+        _pw_page = page
         try:
             resp = await _pw_page.goto(SITE_URL, wait_until="networkidle", timeout=30000)
             status = resp.status if resp else 'N/A'
@@ -243,15 +530,88 @@ async def _ensure_playwright_page():
         except Exception as e:
             logger.warning(f"[EA API] Warmup navigation failed (non-fatal): {e}")
 
+        try:
+            await _load_playwright_cookies()
+        except Exception as e:
+            logger.warning(f"[EA API] Could not read cookies from browser (non-fatal): {e}")
+
         logger.info("[EA API] Playwright transport initialized")
         return _pw_page
 
 
-async def _get_json(session: aiohttp.ClientSession, url: str, params: dict):
-    """Raw GET request returning JSON."""
-    async with session.get(url, params=params, headers=HEADERS) as r:
-        r.raise_for_status()
-        return await r.json()
+def _set_ea_cookies(cookies: dict[str, str]):
+    """
+    Replace the EA cookies and rebuild the Cookie header carrying them.
+    The header is built here, once per cookie change, not per request.
+    """
+    global _ea_cookies, _ea_cookies_loaded_at, _cookie_headers
+    _ea_cookies = cookies
+    _ea_cookies_loaded_at = time.monotonic()
+    if cookies:
+        _cookie_headers = {"Cookie": "; ".join(f"{k}={v}" for k, v in cookies.items())}
+    else:
+        _cookie_headers = None
+
+
+async def _load_playwright_cookies() -> dict[str, str]:
+    """Read the EA domain cookies from the Playwright context."""
+    cookies = await _pw_context.cookies(SITE_URL)
+    _set_ea_cookies({c["name"]: c["value"] for c in cookies})
+    _save_cached_cookies()
+    logger.debug(f"[EA API] Loaded {len(_ea_cookies)} cookie(s) from browser")
+    return _ea_cookies
+
+
+def _save_cached_cookies():
+    """Persist the browser's EA cookies for the next start (best effort)."""
+    try:
+        EA_COOKIE_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        # Created 0600 so the cookies are never readable under the umask, and
+        # tightened in case an older file was written with wider permissions
+        fd = os.open(EA_COOKIE_CACHE_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            os.fchmod(fd, 0o600)
+            f.write(json.dumps(_ea_cookies))
+    except OSError as e:
+        logger.debug(f"[EA API] Could not save cookie cache: {e}")
+
+
+def _load_cached_cookies() -> bool:
+    """Load EA cookies saved by a previous run. Returns True if any were found."""
+    try:
+        cookies = json.loads(EA_COOKIE_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return False
+    if not isinstance(cookies, dict) or not cookies:
+        return False
+    _set_ea_cookies(cookies)
+    logger.debug(f"[EA API] Loaded {len(_ea_cookies)} cookie(s) from {EA_COOKIE_CACHE_PATH}")
+    return True
+
+
+def _request_timeout(path: str, params: dict) -> aiohttp.ClientTimeout | None:
+    """Timeout for one API request, or None for the session default (HTTP_TIMEOUT)."""
+    if path == "/clubs/info":
+        return CLUB_INFO_TIMEOUT
+    if path in _MATCH_ENDPOINTS and int(params.get("maxResultCount", 0)) > 10:
+        return LARGE_MATCHES_TIMEOUT
+    return None
+
+
+async def _get_json(session: aiohttp.ClientSession, url: str, params: dict, timeout: aiohttp.ClientTimeout | None = None):
+    """Raw GET request returning JSON. HTTP errors are raised as EAApiHttpError."""
+    # HEADERS are the session's defaults; only the cookies go per request
+    kwargs = {"timeout": timeout} if timeout else {}
+    async with session.get(url, params=params, headers=_cookie_headers, **kwargs) as r:
+        try:
+            r.raise_for_status()
+        except aiohttp.ClientResponseError as e:
+            raise EAApiHttpError(
+                e.status, str(r.url), f"{e.status}, message='{e.message}', url='{r.url}'",
+                retry_after=_parse_retry_after(r.headers.get("Retry-After")),
+            ) from e
+        # Parse the raw bytes: r.json() would decode the whole body to str first
+        return _json_loads(await r.read())
 
 
 async def _reset_playwright_page():
@@ -278,17 +638,16 @@ async def _get_json_playwright(path: str, params: dict):
     page = await _ensure_playwright_page()
     url = _build_url(path, params)
     try:
-        result = await page.evaluate(
-            """async (url) => {
-                const resp = await fetch(url, {
-                    method: 'GET',
-                    credentials: 'include',
-                    headers: { 'Accept': 'application/json, text/plain, */*' }
-                });
-                return { status: resp.status, body: await resp.text() };
-            }""",
-            url,
+        # page.evaluate has no timeout of its own; bound it so a stuck page
+        # fails fast (and gets reset below) instead of holding a request slot
+        result = await asyncio.wait_for(
+            page.evaluate("url => window.eaFetch(url)", url),
+            timeout=EA_PLAYWRIGHT_TIMEOUT_MS / 1000,
         )
+    except asyncio.TimeoutError:
+        logger.warning(f"[EA API] fetch() timed out after {EA_PLAYWRIGHT_TIMEOUT_MS}ms, resetting page for next retry")
+        await _reset_playwright_page()
+        raise RuntimeError(f"Playwright fetch timed out for {url}")
     except Exception as e:
         # Page context is likely dead/stale — reset it for next attempt
         logger.warning(f"[EA API] fetch() failed, resetting page for next retry: {e}")
@@ -300,12 +659,51 @@ async def _get_json_playwright(path: str, params: dict):
     logger.debug(f"[EA API] Playwright fetch for {path}: status={status}, body_len={len(body)}")
 
     if status >= 400:
-        raise EAApiHttpError(status, url, f"{status}, body='{body[:200]}'")
+        raise EAApiHttpError(
+            status, url, f"{status}, body='{body[:200]}'",
+            retry_after=_parse_retry_after(result.get("retryAfter")),
+        )
 
-    return json.loads(body)
+    return _json_loads(body)
 
 
-async def warmup_session(session: aiohttp.ClientSession):
+async def _get_json_seeded(session: aiohttp.ClientSession, url: str, path: str, params: dict, timeout: aiohttp.ClientTimeout | None = None):
+    """GET JSON directly over aiohttp using the cookies the browser earned.
+
+    The browser is only used to pass Akamai's checks; requests then go
+    straight over aiohttp instead of through page.evaluate(fetch). If EA
+    rejects the cookies with 403, the request is retried via fetch() in the
+    browser page and the browser's fresh cookies are picked up.
+    """
+    if _pw_context is not None and time.monotonic() - _ea_cookies_loaded_at > EA_COOKIE_REFRESH_SECONDS:
+        try:
+            await _load_playwright_cookies()
+        except Exception as e:
+            logger.debug(f"[EA API] Cookie refresh from browser failed: {e}")
+
+    if _ea_cookies:
+        try:
+            return await _get_json(session, url, params, timeout)
+        except EAApiHttpError as e:
+            if e.status != 403:
+                raise
+            logger.info(f"[EA API] Direct request for {path} got 403, falling back to browser fetch()")
+
+    data = await _get_json_playwright(path, params)
+    try:
+        await _load_playwright_cookies()
+    except Exception as e:
+        logger.debug(f"[EA API] Cookie refresh from browser failed: {e}")
+    return data
+
+
+def _remember_response_cookies(response: aiohttp.ClientResponse):
+    """Merge Set-Cookie values from a warmup response into the EA cookies."""
+    if response.cookies:
+        _set_ea_cookies({**_ea_cookies, **{k: m.value for k, m in response.cookies.items()}})
+
+
+async def warmup_session(session: aiohttp.ClientSession | None = None):
     """
     Warm up the session by visiting EA's HTML pages.
     This helps acquire cookies and pass through Cloudflare/WAF checks,
@@ -314,133 +712,210 @@ async def warmup_session(session: aiohttp.ClientSession):
     Best-effort operation: errors are silently ignored.
     
     Args:
-        session: aiohttp ClientSession to warm up
+        session: aiohttp ClientSession to warm up (None = shared session)
     """
+    session = session or get_shared_session()
     logger.debug("[EA API] Warming up session by visiting EA's website...")
     if EA_USE_PLAYWRIGHT and PLAYWRIGHT_AVAILABLE:
+        # First warmup after a restart: use the cookies saved by the last run
+        # instead of paying for a Chromium launch. Only a real API request can
+        # tell whether EA still accepts them, so stale ones are caught by the
+        # first 403, which brings the browser up via _get_json_seeded.
+        if _pw_page is None:
+            if _ea_cookies:
+                return
+            if _load_cached_cookies():
+                logger.info("[EA API] Reusing saved EA cookies, skipping browser warmup")
+                return
         try:
             await _ensure_playwright_page()  # Warmup happens during page init
             logger.debug("[EA API] Playwright warmup complete")
             return
         except Exception as e:
             logger.warning(f"[EA API] Playwright warmup failed, falling back to aiohttp warmup: {e}")
+    # Merged over the session's API defaults, so the Sec-Fetch-* values are
+    # overridden with what a browser sends for a page navigation
     html_headers = {
         "User-Agent": "Mozilla/5.0",
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
         "Accept-Language": "en-US,en;q=0.9",
         "Upgrade-Insecure-Requests": "1",
+        "Sec-Fetch-Dest": "document",
+        "Sec-Fetch-Mode": "navigate",
+        "Sec-Fetch-Site": "none",
     }
     
-    # Visit main EA site
-    try:
-        async with session.get(SITE_URL, headers=html_headers) as r:
-            await r.text()
-            logger.debug(f"[EA API] Warmup: visited {SITE_URL} (status: {r.status})")
-    except Exception as e:
-        logger.debug(f"[EA API] Warmup: failed to visit {SITE_URL}: {e}")
-    
-    # Visit Pro Clubs page
-    try:
-        async with session.get(SITE_REFERER, headers=html_headers) as r:
-            await r.text()
-            logger.debug(f"[EA API] Warmup: visited {SITE_REFERER} (status: {r.status})")
-    except Exception as e:
-        logger.debug(f"[EA API] Warmup: failed to visit {SITE_REFERER}: {e}")
-    
+    async def visit(url: str):
+        try:
+            async with session.get(url, headers=html_headers) as r:
+                # Read the body so the connection can be reused (and any
+                # challenge completes), but skip decoding it - only the
+                # cookies are wanted
+                await r.read()
+                _remember_response_cookies(r)
+                logger.debug(f"[EA API] Warmup: visited {url} (status: {r.status})")
+        except Exception as e:
+            logger.debug(f"[EA API] Warmup: failed to visit {url}: {e}")
+
+    # Visit the main EA site and the Pro Clubs page concurrently; they are
+    # currently the same URL, which is then only fetched once
+    await asyncio.gather(*(visit(url) for url in dict.fromkeys((SITE_URL, SITE_REFERER))))
+
     logger.debug("[EA API] Session warmup complete")
 
 
-async def fetch_json(session: aiohttp.ClientSession, path: str, params: dict, max_attempts: int = 3):
+async def fetch_json(session: aiohttp.ClientSession, path: str, params: dict, max_attempts: int = EA_MAX_ATTEMPTS):
     """
     Fetch JSON from EA API with retry logic.
+
+    Responses from endpoints in _CACHE_TTLS are reused for their TTL.
+    Concurrent identical requests share a single fetch, cached endpoint or
+    not, and a failure of that fetch is raised to all of them. The returned
+    data is never shared with another caller, so mutating it is safe.
     
     Args:
-        session: aiohttp ClientSession to use for the request
+        session: aiohttp ClientSession to use for the request (None = shared session).
+                 The browser-like HEADERS are expected as session defaults,
+                 as get_shared_session() sets them.
         path: API endpoint path (e.g., "/clubs/info")
         params: Query parameters as a dictionary
-        max_attempts: Maximum number of retry attempts (default: 3)
+        max_attempts: Maximum number of retry attempts (default: EA_MAX_ATTEMPTS, 3)
     
     Returns:
         JSON response data as dict/list
         
     Raises:
         RuntimeError: If all retry attempts fail
+        EAApiCircuitOpenError: If EA requests are paused after repeated failures
     """
+    key = (path, tuple(sorted(params.items())))
+    ttl = _CACHE_TTLS.get(path)
+    if ttl:
+        cached = _response_cache.get(key)
+        if cached and time.monotonic() - cached[0] < ttl:
+            logger.debug("[EA API] Cache hit for %s", path)
+            return copy.deepcopy(cached[1])
+
+    # shield: one caller being cancelled must not cancel the shared fetch.
+    # A failed fetch raises in every caller that joined it, rather than each
+    # of them retrying on its own afterwards.
+    entry = _inflight.get(key)
+    if entry is not None:
+        entry[1] += 1
+        return copy.deepcopy(await asyncio.shield(entry[0]))
+    fetch = _fetch_json_uncached(session, path, params, max_attempts)
+    task = asyncio.ensure_future(_fetch_and_cache(key, fetch) if ttl else fetch)
+    entry = _inflight[key] = [task, 0]
+    task.add_done_callback(functools.partial(_inflight_done, key))
+    data = await asyncio.shield(task)
+    # Unregister before handing out the result so nobody can join from here
+    # on; the original only needs copying if the cache or another caller
+    # shares it.
+    _inflight_done(key, task)
+    return copy.deepcopy(data) if ttl or entry[1] else data
+
+
+async def _fetch_and_cache(key: tuple, fetch) -> object:
+    """Await *fetch* and store its result in the response cache under *key*."""
+    data = await fetch
+    now = time.monotonic()
+    if len(_response_cache) >= _RESPONSE_CACHE_MAX:
+        for k, (fetched_at, _) in list(_response_cache.items()):
+            if now - fetched_at >= _CACHE_TTLS.get(k[0], 0):
+                del _response_cache[k]
+    _response_cache[key] = (now, data)
+    return data
+
+
+def _inflight_done(key: tuple, task: asyncio.Task):
+    entry = _inflight.get(key)
+    if entry is not None and entry[0] is task:
+        del _inflight[key]
+    # Mark the error retrieved even if every caller was cancelled meanwhile
+    if not task.cancelled():
+        task.exception()
+
+
+async def _fetch_json_uncached(session: aiohttp.ClientSession, path: str, params: dict, max_attempts: int):
+    """fetch_json without the response cache: the retry loop itself."""
+    global _circuit_failures, _circuit_open_until
+    if time.monotonic() < _circuit_open_until:
+        raise EAApiCircuitOpenError(f"EA API circuit open, not requesting {path}")
+
+    session = session or get_shared_session()
     url = f"{EA_BASE}{path}"
+    timeout = _request_timeout(path, params)
     last_exc = None
     
-    logger.debug(f"[EA API] Fetching {path} with params: {params}")
+    # Lazy %-formatting on the per-request/per-match debug lines: nothing is
+    # formatted unless DEBUG logging is actually on
+    logger.debug("[EA API] Fetching %s with params: %s", path, params)
 
+    sleep_time = RETRY_BACKOFF_BASE
     for attempt in range(1, max_attempts + 1):
+        retry_after = None
         try:
-            logger.debug(f"[EA API] Attempt {attempt}/{max_attempts} for {path}")
-            if EA_USE_PLAYWRIGHT and PLAYWRIGHT_AVAILABLE:
-                data = await _get_json_playwright(path, params)
-            else:
-                data = await _get_json(session, url, params)
+            logger.debug("[EA API] Attempt %d/%d for %s", attempt, max_attempts, path)
+            await _EA_BUCKET.acquire()
+            # Held for the request only, not across the retry sleeps below
+            async with _get_ea_semaphore():
+                if EA_USE_PLAYWRIGHT and PLAYWRIGHT_AVAILABLE:
+                    data = await _get_json_seeded(session, url, path, params, timeout)
+                else:
+                    data = await _get_json(session, url, params, timeout)
             logger.info(f"[EA API] ✅ Successfully fetched {path} (attempt {attempt})")
+            _circuit_failures = 0
             return data
         except EAApiHttpError as e:
             last_exc = e
-            if e.status in (403, 503):
-                # 403 Forbidden / 503 Service Unavailable - likely rate limiting or WAF
-                logger.warning(f"[EA API] ⚠️ HTTP {e.status} on {path} (attempt {attempt}/{max_attempts}) - possible rate limit or WAF block")
-                if attempt < max_attempts:
-                    sleep_time = random.uniform(0.5, 1.5)
-                    logger.debug(f"[EA API] Waiting {sleep_time:.2f}s before retry...")
-                    await asyncio.sleep(sleep_time)
-                    continue
-            else:
-                # Other HTTP errors (404, 500, etc.)
-                logger.warning(f"[EA API] ⚠️ HTTP {e.status} on {path} (attempt {attempt}/{max_attempts})")
-                if attempt < max_attempts:
-                    logger.debug(f"[EA API] Waiting 0.5s before retry...")
-                    await asyncio.sleep(0.5)
-                    continue
+            retry_after = e.retry_after
+            if e.status in _PERMANENT_STATUSES:
+                logger.warning(f"[EA API] ⚠️ HTTP {e.status} on {path} (attempt {attempt}/{max_attempts}) - not retrying")
                 break
-        except aiohttp.ClientResponseError as e:
-            last_exc = e
-            if e.status in (403, 503):
-                # 403 Forbidden / 503 Service Unavailable - likely rate limiting or WAF
+            if e.status in _RATE_LIMIT_STATUSES:
+                # 403 Forbidden / 429 Too Many Requests / 503 Service Unavailable - likely rate limiting or WAF
                 logger.warning(f"[EA API] ⚠️ HTTP {e.status} on {path} (attempt {attempt}/{max_attempts}) - possible rate limit or WAF block")
-                if attempt < max_attempts:
-                    sleep_time = random.uniform(0.5, 1.5)
-                    logger.debug(f"[EA API] Waiting {sleep_time:.2f}s before retry...")
-                    await asyncio.sleep(sleep_time)
-                    continue
             else:
-                # Other HTTP errors (404, 500, etc.)
+                # Other HTTP errors (500, 502, etc.)
                 logger.warning(f"[EA API] ⚠️ HTTP {e.status} on {path} (attempt {attempt}/{max_attempts})")
-                if attempt < max_attempts:
-                    logger.debug(f"[EA API] Waiting 0.5s before retry...")
-                    await asyncio.sleep(0.5)
-                    continue
-                break
         except Exception as e:
             # Network errors, timeouts, JSON parse errors, etc.
             last_exc = e
             logger.warning(f"[EA API] ⚠️ Error on {path} (attempt {attempt}/{max_attempts}): {type(e).__name__}: {e}")
-            if attempt < max_attempts:
-                logger.debug(f"[EA API] Waiting 0.5s before retry...")
-                await asyncio.sleep(0.5)
-                continue
-            break
 
-    logger.error(f"[EA API] ❌ All {max_attempts} attempts failed for {path}: {last_exc}")
-    if isinstance(last_exc, aiohttp.ClientResponseError) and last_exc.status == 403:
-        raise EAApiForbiddenError(path, f"EA API forbidden after {max_attempts} attempts: {last_exc}")
+        if attempt < max_attempts:
+            sleep_time = _compute_backoff(sleep_time, retry_after)
+            logger.debug("[EA API] Waiting %.2fs before retry...", sleep_time)
+            await asyncio.sleep(sleep_time)
+
+    logger.error(f"[EA API] ❌ Giving up on {path} after {attempt} attempt(s): {last_exc}")
+    # A permanent error (unknown club, bad params) says nothing about EA's health
+    if not (isinstance(last_exc, EAApiHttpError) and last_exc.status in _PERMANENT_STATUSES):
+        _circuit_failures += 1
+        if _circuit_failures >= EA_CIRCUIT_FAILURES:
+            _circuit_failures = 0
+            _circuit_open_until = time.monotonic() + EA_CIRCUIT_OPEN_SECONDS
+            logger.error(f"[EA API] ❌ {EA_CIRCUIT_FAILURES} requests failed in a row, pausing all EA requests for {EA_CIRCUIT_OPEN_SECONDS:.0f}s")
     if isinstance(last_exc, EAApiHttpError) and last_exc.status == 403:
-        raise EAApiForbiddenError(path, f"EA API forbidden after {max_attempts} attempts: {last_exc}")
-    raise RuntimeError(f"EA API request failed after {max_attempts} attempts: {last_exc}")
+        raise EAApiForbiddenError(path, f"EA API forbidden after {attempt} attempt(s): {last_exc}")
+    raise RuntimeError(f"EA API request failed after {attempt} attempt(s): {last_exc}") from last_exc
+
+
+def invalidate_club_info(club_id: int):
+    """Drop cached /clubs/info responses for a club, on every platform."""
+    cid = str(club_id)
+    for key in [k for k in _response_cache if k[0] == "/clubs/info" and ("clubIds", cid) in k[1]]:
+        del _response_cache[key]
 
 
 async def fetch_club_info(session, platform: str, club_id: int):
     """
     Fetch club information from EA API.
     Automatically falls back to the other generation platform if the first attempt fails.
+    Responses are cached for 5 minutes (see _CACHE_TTLS and invalidate_club_info).
     
     Args:
-        session: aiohttp ClientSession
+        session: aiohttp ClientSession (None = shared session)
         platform: Platform string (e.g., "common-gen5" or "common-gen4")
         club_id: Numeric club ID
     
@@ -450,8 +925,9 @@ async def fetch_club_info(session, platform: str, club_id: int):
         - used_platform: The platform that worked (may differ from input if fallback occurred)
     """
     logger.debug(f"[EA API] Fetching club info for club {club_id} on platform {platform}")
+    cid = str(club_id)
     try:
-        info = await fetch_json(session, "/clubs/info", {"platform": platform, "clubIds": str(club_id)})
+        info = await fetch_json(session, "/clubs/info", {"platform": platform, "clubIds": cid})
         logger.info(f"[EA API] ✅ Successfully fetched club info for {club_id} on {platform}")
         return info, platform
     except EAApiForbiddenError:
@@ -461,11 +937,69 @@ async def fetch_club_info(session, platform: str, club_id: int):
         # Try the other generation platform
         other = "common-gen4" if platform == "common-gen5" else "common-gen5"
         logger.warning(f"[EA API] Failed to fetch club info on {platform}, trying fallback platform {other}")
-        info = await fetch_json(session, "/clubs/info", {"platform": other, "clubIds": str(club_id)})
+        info = await fetch_json(session, "/clubs/info", {"platform": other, "clubIds": cid})
         logger.info(f"[EA API] ✅ Successfully fetched club info for {club_id} on fallback platform {other}")
         return info, other
 
 
+async def fetch_clubs_info_bulk(session, platform: str, club_ids) -> dict[int, dict]:
+    """
+    Fetch club information for several clubs on one platform in a single
+    request (EA's clubIds takes a comma-separated list).
+
+    Clubs whose info is already cached are not requested again. Each club
+    fetched is cached the way fetch_club_info() would cache it, so later
+    fetch_club_info() calls for these clubs are cache hits.
+
+    Args:
+        session: aiohttp ClientSession (None = shared session)
+        platform: Platform string (e.g., "common-gen5" or "common-gen4")
+        club_ids: Numeric club IDs
+
+    Returns:
+        {club_id: info_dict} for the clubs EA returned; unknown clubs are left out
+    """
+    ttl = _CACHE_TTLS["/clubs/info"]
+    now = time.monotonic()
+    result = {}
+    missing = []
+    for cid in dict.fromkeys(str(c) for c in club_ids):
+        cached = _response_cache.get(("/clubs/info", (("clubIds", cid), ("platform", platform))))
+        if cached and now - cached[0] < ttl and isinstance(cached[1], dict) and cid in cached[1]:
+            result[int(cid)] = copy.deepcopy(cached[1][cid])
+        else:
+            missing.append(cid)
+    if not missing:
+        return result
+
+    logger.debug(f"[EA API] Fetching club info for {len(missing)} club(s) on platform {platform}")
+    payload = await fetch_json(session, "/clubs/info", {"platform": platform, "clubIds": ",".join(missing)})
+    # EA API returns different formats, normalize to {club_id_str: info}
+    if isinstance(payload, list):
+        by_id = {str(e.get("clubId")): e for e in payload if isinstance(e, dict)}
+    elif isinstance(payload, dict):
+        by_id = payload
+    else:
+        by_id = {}
+
+    now = time.monotonic()
+    for cid in missing:
+        info = by_id.get(cid)
+        if isinstance(info, dict):
+            _response_cache[("/clubs/info", (("clubIds", cid), ("platform", platform)))] = (now, {cid: copy.deepcopy(info)})
+            result[int(cid)] = info
+    logger.info(f"[EA API] ✅ Fetched club info for {len(missing)} club(s) on {platform} in one request")
+    return result
+
+
+def _match_endpoints_for(platform: str, cid: str) -> list[str]:
+    """Match endpoints to try for a club, the one that last returned matches first."""
+    known = _match_endpoint_cache.get((platform, cid))
+    if known is None:
+        return list(_MATCH_ENDPOINTS)
+    return [known] + [e for e in _MATCH_ENDPOINTS if e != known]
+
+
 async def fetch_latest_match(session, platform: str, club_id: int):
     """
     Get the newest match from the club's match history.
@@ -477,7 +1011,7 @@ async def fetch_latest_match(session, platform: str, club_id: int):
     - No matchType (all matches)
     
     Args:
-        session: aiohttp ClientSession
+        session: aiohttp ClientSession (None = shared session)
         platform: Platform string (e.g., "common-gen5" or "common-gen4")
         club_id: Numeric club ID
     
@@ -488,12 +1022,8 @@ async def fetch_latest_match(session, platform: str, club_id: int):
     """
     logger.debug(f"[EA API] Fetching latest match for club {club_id} on platform {platform}")
     
-    # Try different endpoint paths and match types - EA API may have changed
-    endpoint_attempts = [
-        "/clubs/matches",  # Current endpoint
-        "/matches",        # Alternative endpoint (without /clubs prefix)
-    ]
-    
+    # Try different match types - EA API may have changed. The endpoint that
+    # last worked for this club is tried first (see _match_endpoints_for).
     match_type_attempts = [
         "leagueMatch",  # Try league matches first (most common)
         "gameType11",   # Generic match type
@@ -501,12 +1031,13 @@ async def fetch_latest_match(session, platform: str, club_id: int):
         "playoffMatch", # Playoff matches
     ]
     
-    for endpoint_path in endpoint_attempts:
+    cid = str(club_id)
+    for endpoint_path in _match_endpoints_for(platform, cid):
         for match_type_attempt in match_type_attempts:
             # EA API parameters for fetching matches
             params = {
                 "platform": platform,
-                "clubIds": str(club_id),
+                "clubIds": cid,
                 "maxResultCount": "1"  # Only get the most recent match
             }
             
@@ -522,6 +1053,7 @@ async def fetch_latest_match(session, platform: str, club_id: int):
                 matches = payload if isinstance(payload, list) else payload.get("matches", [])
                 
                 if matches and len(matches) > 0:
+                    _match_endpoint_cache[(platform, cid)] = endpoint_path
                     newest = matches[0]  # Matches are pre-sorted by EA API (newest first)
                     
                     # Detect match type from the response data
@@ -539,6 +1071,10 @@ async def fetch_latest_match(session, platform: str, club_id: int):
                 else:
                     logger.debug(f"[EA API] No matches found for club {club_id} with {endpoint_path} and matchType={match_type_attempt or 'none'}")
                     continue  # Try next matchType
+            except EAApiForbiddenError:
+                # Hard WAF block, do not spam every endpoint/matchType combination.
+                # (Must come before RuntimeError, which it subclasses.)
+                raise
             except RuntimeError as e:
                 # HTTP 400 or other API errors - try next matchType or endpoint
                 error_msg = str(e)
@@ -549,9 +1085,6 @@ async def fetch_latest_match(session, platform: str, club_id: int):
                     # Other errors (network, etc.) - log and try next
                     logger.debug(f"[EA API] Error with {endpoint_path} and matchType={match_type_attempt or 'none'}: {e}, trying next option...")
                     continue
-            except EAApiForbiddenError:
-                # Hard WAF block, do not spam every endpoint/matchType combination.
-                raise
             except Exception as e:
                 # Other unexpected errors - log and try next
                 logger.debug(f"[EA API] Unexpected error with {endpoint_path} and matchType={match_type_attempt or 'none'}: {e}, trying next option...")
@@ -559,6 +1092,7 @@ async def fetch_latest_match(session, platform: str, club_id: int):
     
     # All attempts failed
     logger.error(f"[EA API] ❌ All endpoint and matchType combinations failed for club {club_id}")
+    _match_endpoint_cache.pop((platform, cid), None)
     return None, None
 
 
@@ -597,52 +1131,62 @@ async def fetch_latest_playoff_match(session, platform: str, club_id: int):
         return None, None
 
 
+async def _fetch_matches_of_type(session, platform: str, club_id: int, max_count: int, match_type: str) -> list:
+    """
+    Fetch one match type's history, trying each known matches endpoint in turn.
+    Returns the first non-empty list of matches, or an empty list.
+    """
+    cid = str(club_id)
+    for endpoint_path in _match_endpoints_for(platform, cid):
+        params = {
+            "platform": platform,
+            "clubIds": cid,
+            "maxResultCount": str(max_count),
+            "matchType": match_type,
+        }
+        try:
+            logger.debug(f"[EA API] fetch_all_matches: trying {endpoint_path} matchType={match_type}")
+            payload = await fetch_json(session, endpoint_path, params)
+            matches = payload if isinstance(payload, list) else payload.get("matches", [])
+            if matches:
+                _match_endpoint_cache[(platform, cid)] = endpoint_path
+                logger.info(f"Found {len(matches)} matches for club {club_id} (endpoint={endpoint_path}, type={match_type})")
+                return matches
+            logger.debug(f"[EA API] fetch_all_matches: no matches returned for {endpoint_path} matchType={match_type}")
+        except EAApiForbiddenError:
+            raise
+        except Exception as e:
+            logger.warning(f"[EA API] fetch_all_matches: failed for {endpoint_path} matchType={match_type}: {e}")
+    return []
+
+
 async def fetch_all_matches(session, platform: str, club_id: int, max_count: int = 100, match_type: str = None):
     """
     Get matches from the club's match history.
     Returns list of match dicts or empty list
 
     Args:
-        session: aiohttp ClientSession
+        session: aiohttp ClientSession (None = shared session)
         platform: Platform string (e.g., "common-gen5" or "common-gen4")
         club_id: Numeric club ID
         max_count: Maximum number of matches to fetch
         match_type: Optional match type filter (e.g., "leagueMatch", "playoffMatch").
                     When None, fetches both league and playoff matches and merges them.
     """
-    endpoint_attempts = [
-        "/clubs/matches",
-        "/matches",
-    ]
-
-    # When no specific type requested, fetch league + playoff separately and merge
+    # When no specific type requested, fetch league + playoff concurrently and merge
     if not match_type:
+        per_type = await asyncio.gather(*(
+            _fetch_matches_of_type(session, platform, club_id, max_count, mt)
+            for mt in ("leagueMatch", "playoffMatch")
+        ))
         all_matches = []
         seen_ids = set()
-        for mt in ["leagueMatch", "playoffMatch"]:
-            for endpoint_path in endpoint_attempts:
-                params = {
-                    "platform": platform,
-                    "clubIds": str(club_id),
-                    "maxResultCount": str(max_count),
-                    "matchType": mt,
-                }
-                try:
-                    logger.debug(f"[EA API] fetch_all_matches(all): trying {endpoint_path} matchType={mt}")
-                    payload = await fetch_json(session, endpoint_path, params)
-                    matches = payload if isinstance(payload, list) else payload.get("matches", [])
-                    if matches:
-                        logger.info(f"Found {len(matches)} {mt} matches for club {club_id}")
-                        for m in matches:
-                            mid = m.get("matchId", id(m))
-                            if mid not in seen_ids:
-                                seen_ids.add(mid)
-                                all_matches.append(m)
-                        break  # Got results from this endpoint, skip fallback endpoint
-                except EAApiForbiddenError:
-                    raise
-                except Exception as e:
-                    logger.warning(f"[EA API] fetch_all_matches(all): failed for {endpoint_path} matchType={mt}: {e}")
+        for matches in per_type:
+            for m in matches:
+                mid = m.get("matchId", id(m))
+                if mid not in seen_ids:
+                    seen_ids.add(mid)
+                    all_matches.append(m)
 
         if all_matches:
             # Sort by timestamp descending (newest first) and limit
@@ -653,28 +1197,14 @@ async def fetch_all_matches(session, platform: str, club_id: int, max_count: int
         return []
 
     # Specific match type requested
-    for endpoint_path in endpoint_attempts:
-        params = {
-            "platform": platform,
-            "clubIds": str(club_id),
-            "maxResultCount": str(max_count),
-            "matchType": match_type,
-        }
-        try:
-            logger.debug(f"[EA API] fetch_all_matches: trying {endpoint_path} matchType={match_type}")
-            payload = await fetch_json(session, endpoint_path, params)
-            matches = payload if isinstance(payload, list) else payload.get("matches", [])
-            if matches:
-                logger.info(f"Found {len(matches)} matches for club {club_id} (endpoint={endpoint_path}, type={match_type})")
-                return matches
-            logger.debug(f"[EA API] fetch_all_matches: no matches returned for {endpoint_path} matchType={match_type}")
-        except EAApiForbiddenError:
-            raise
-        except Exception as e:
-            logger.warning(f"[EA API] fetch_all_matches: failed for {endpoint_path} matchType={match_type}: {e}")
+    matches = await _fetch_matches_of_type(session, platform, club_id, max_count, match_type)
+    if not matches:
+        logger.error(f"[EA API] ❌ fetch_all_matches: all attempts exhausted for club {club_id}")
+    return matches
 
-    logger.error(f"[EA API] ❌ fetch_all_matches: all attempts exhausted for club {club_id}")
-    return []
+
+# interpret_match_result() outcome -> index into a [wins, losses, draws, played] tally
+_RESULT_SLOT = {"W": 0, "L": 1, "D": 2}
 
 
 def calculate_player_wld(matches, club_id: int, player_name: str):
@@ -686,10 +1216,9 @@ def calculate_player_wld(matches, club_id: int, player_name: str):
     - clubs: { "clubId": { "result": "1/2/3", "players": {...} } }
     - result: "1" = Win, "2" = Loss, "3" = Draw (probably)
     """
-    wins = 0
-    losses = 0
-    draws = 0
-    matches_played = 0
+    tally = [0, 0, 0, 0]  # wins, losses, draws, matches_played
+    target = player_name.lower()  # compared case-insensitively, lowered once
+    cid = str(club_id)  # EA keys clubs and players by string ID
     
     logger.info(f"Analyzing {len(matches)} matches for player '{player_name}' in club {club_id}")
     
@@ -698,54 +1227,37 @@ def calculate_player_wld(matches, club_id: int, player_name: str):
         clubs = match.get("clubs", {})
         
         # Find our club in the match
-        our_club = clubs.get(str(club_id))
+        our_club = clubs.get(cid)
         if not our_club:
-            logger.debug(f"Match {idx+1}: Club {club_id} not found in match")
+            logger.debug("Match %d: Club %s not found in match", idx + 1, club_id)
             continue
         
         # Players are at the TOP level of match, nested by club ID
         # Structure: match.players[clubId][playerId]
         all_players = match.get("players", {})
-        club_players = all_players.get(str(club_id), {})
+        club_players = all_players.get(cid, {})
         
         if not club_players:
-            logger.debug(f"Match {idx+1}: No players data for club {club_id}")
+            logger.debug("Match %d: No players data for club %s", idx + 1, club_id)
             continue
-            
-        player_in_match = False
         
-        # Search through club's players
-        if isinstance(club_players, dict):
-            for player_id, player_data in club_players.items():
-                if isinstance(player_data, dict):
-                    # Try different field names for player name
-                    pname = player_data.get("playername") or player_data.get("name") or player_data.get("playerName")
-                    if pname and pname.lower() == player_name.lower():
-                        player_in_match = True
-                        logger.debug(f"Match {idx+1}: Found player '{pname}'")
-                        break
+        # Search through club's players, trying the different name fields
+        player_in_match = isinstance(club_players, dict) and any(
+            (p.get("playername") or p.get("name") or p.get("playerName") or "").lower() == target
+            for p in club_players.values()
+            if isinstance(p, dict)
+        )
         
         if not player_in_match:
-            logger.debug(f"Match {idx+1}: Player '{player_name}' not found in match")
+            logger.debug("Match %d: Player '%s' not found in match", idx + 1, player_name)
             continue
         
-        matches_played += 1
-        
         # Determine result (handles DNF wins with result=16385 + winnerByDnf=1)
         result = interpret_match_result(our_club)
-        if result == "W":
-            wins += 1
-            logger.debug(f"Match {idx+1}: WIN")
-        elif result == "L":
-            losses += 1
-            logger.debug(f"Match {idx+1}: LOSS")
-        elif result == "D":
-            draws += 1
-            logger.debug(f"Match {idx+1}: DRAW")
+        tally[_RESULT_SLOT[result]] += 1
+        tally[3] += 1
+        logger.debug("Match %d: %s", idx + 1, result)
     
+    wins, losses, draws, matches_played = tally
     logger.info(f"Final stats for {player_name}: {wins}W-{losses}L-{draws}D from {matches_played} matches")
     return wins, losses, draws, matches_played
-
-
-
-
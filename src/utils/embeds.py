@@ -4,8 +4,29 @@ Discord embed builders for match results and stats.
 import discord
 from collections.abc import Callable
 from datetime import datetime, timezone
+from functools import lru_cache
+from collections import namedtuple
+from operator import attrgetter, itemgetter
 from utils.ea_api import interpret_match_result
 
+AWARD_COLOR = 0xF1C40F  # discord.Color.gold()
+
+# interpret_match_result() outcome -> (emoji, label, embed color)
+MATCH_RESULT_STYLE = {
+    "W": ("✅", "Win", 0x2ecc71),  # Green
+    "L": ("❌", "Loss", 0xe74c3c),  # Red
+    "D": ("🤝", "Draw", 0xf1c40f),  # Yellow
+}
+
+_UTC_FORMAT = "%Y-%m-%d %H:%M UTC"
+_fromtimestamp = datetime.fromtimestamp
+
+# Per-player fields read from EA match data, fetched in one call per player
+_PLAYER_FIELDS = itemgetter("playername", "goals", "assists", "rating", "mom")
+
+# One player's line in a match, numbers already converted from EA's strings
+PlayerStat = namedtuple("PlayerStat", "name goals assists rating mom")
+
 
 class PaginatedEmbedView(discord.ui.View):
     """
@@ -20,28 +41,59 @@ class PaginatedEmbedView(discord.ui.View):
         # edit it on timeout to visually disable the buttons.
         msg = await interaction.followup.send(embed=pages[0], view=view, wait=True)
         view.message = msg
+
+    Pages can also be built on demand instead, which keeps only the last
+    couple of built pages in memory::
+
+        view = PaginatedEmbedView(build_page=make_embed, page_count=len(items))
+        view.message = await interaction.followup.send(embed=view.page(0), view=view, wait=True)
     """
 
+    _PAGE_CACHE_SIZE = 2  # on-demand pages kept around (current + previous)
+
     def __init__(
         self,
-        embeds: list[discord.Embed],
+        embeds: list[discord.Embed] | None = None,
         *,
         timeout: float = 180.0,
         page_files: dict[int, Callable[[], discord.File | None]] | None = None,
+        build_page: Callable[[int], discord.Embed] | None = None,
+        page_count: int | None = None,
     ):
         super().__init__(timeout=timeout)
-        if not embeds:
+        if embeds is not None:
+            page_count = len(embeds)
+        elif build_page is None:
+            raise ValueError("either embeds or build_page is required")
+        if not page_count:
             raise ValueError("embeds must not be empty")
         self.embeds = embeds
+        self._build_page = build_page
+        self._page_cache: dict[int, discord.Embed] = {}
         self.current_page = 0
+        self._last_page = page_count - 1  # page count is fixed for the view's lifetime
         self.message: discord.Message | None = None
         self.page_files: dict[int, Callable[[], discord.File | None]] = page_files or {}
         self._update_buttons()
 
+    def page(self, index: int) -> discord.Embed:
+        """Return the embed for page ``index``, building it if needed."""
+        if self.embeds is not None:
+            return self.embeds[index]
+        # Re-inserted on every access so the dict stays in least-recent-first order
+        embed = self._page_cache.pop(index, None)
+        if embed is None:
+            embed = self._build_page(index)
+            if len(self._page_cache) >= self._PAGE_CACHE_SIZE:
+                self._page_cache.pop(next(iter(self._page_cache)))
+        self._page_cache[index] = embed
+        return embed
+
     def _update_buttons(self) -> None:
         """Disable navigation buttons at the first / last page."""
-        self.prev_button.disabled = self.current_page == 0
-        self.next_button.disabled = self.current_page == len(self.embeds) - 1
+        page = self.current_page
+        self.prev_button.disabled = page == 0
+        self.next_button.disabled = page == self._last_page
 
     def _build_edit_kwargs(self) -> dict:
         """Build keyword arguments for edit_message for the current page."""
@@ -51,7 +103,7 @@ class PaginatedEmbedView(discord.ui.View):
             file = factory()
             if file:
                 attachments = [file]
-        return {"embed": self.embeds[self.current_page], "view": self, "attachments": attachments}
+        return {"embed": self.page(self.current_page), "view": self, "attachments": attachments}
 
     @discord.ui.button(label="◀ Previous", style=discord.ButtonStyle.secondary)
     async def prev_button(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -79,15 +131,94 @@ class PaginatedEmbedView(discord.ui.View):
                 )
 
 
+@lru_cache(maxsize=4096)
 def utc_to_str(ts: int) -> str:
-    """Convert UTC timestamp to readable string."""
+    """Convert UTC timestamp to readable string (memoized per timestamp)."""
     try:
-        dt = datetime.fromtimestamp(ts, tz=timezone.utc)
-        return dt.strftime("%Y-%m-%d %H:%M UTC")
+        return _fromtimestamp(ts, tz=timezone.utc).strftime(_UTC_FORMAT)
     except Exception:
         return str(ts)
 
 
+def build_award_embed(
+    *,
+    title: str,
+    description: str,
+    award_name: str,
+    player: dict,
+    score_key: str,
+    score_label: str,
+    footer: str,
+    ranking_name: str | None = None,
+    ranking: list[dict] | None = None,
+    ranking_medals: tuple[str, ...] = ("🥇", "🥈", "🥉"),
+    lead_fields: list[dict] | None = None,
+) -> discord.Embed:
+    """
+    Build a Player of the Month / Player of the Playoffs style summary embed.
+
+    The whole embed is described as one dict and handed to Embed.from_dict,
+    instead of an Embed plus one add_field call per field.
+    """
+    fields = list(lead_fields or [])
+    fields += [
+        {"name": award_name, "value": f"**{player['player_name']}**", "inline": False},
+        {
+            "name": "Individual Performance",
+            "value": f"⚽ **{player['goals']}** goals • 🅰️ **{player['assists']}** assists • ⭐ **{player['avg_rating']:.1f}** avg rating",
+            "inline": False,
+        },
+        {"name": "🎮 Matches", "value": f"**{player['matches_played']}** matches played", "inline": True},
+        {"name": score_label, "value": f"**{player[score_key]:.1f}**", "inline": True},
+    ]
+    if ranking:
+        fields.append({
+            "name": ranking_name,
+            "value": "".join(
+                f"{medal} **{p['player_name']}** ({p[score_key]:.1f})\n"
+                for medal, p in zip(ranking_medals, ranking)
+            ),
+            "inline": False,
+        })
+    return discord.Embed.from_dict({
+        "title": title,
+        "description": description,
+        "color": AWARD_COLOR,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "fields": fields,
+        "footer": {"text": footer},
+    })
+
+
+def _iter_players(club_players: dict):
+    """Yield a PlayerStat for each player of one club in EA match data."""
+    for player_data in club_players.values():
+        if not isinstance(player_data, dict):
+            continue
+        try:
+            name, goals, assists, rating, mom = _PLAYER_FIELDS(player_data)
+        except KeyError:
+            # Some fields missing - fall back to per-field defaults
+            get = player_data.get
+            name, goals, assists, rating, mom = (
+                get("playername", "Unknown"), get("goals"), get("assists"), get("rating"), get("mom")
+            )
+        yield PlayerStat(name, int(goals or 0), int(assists or 0), float(rating or 0), int(mom or 0))
+
+
+def _times(count: int) -> str:
+    """Suffix for a goal/assist count: "x3" above one, "" otherwise."""
+    return f"x{count}" if count > 1 else ""
+
+
+def extract_match_players(match: dict, club_id: int) -> tuple[PlayerStat, ...]:
+    """
+    Player stats for our club in one match, in EA's order. Shared by the
+    match embed and the /matches pages so each walks the players once.
+    """
+    return tuple(_iter_players(match.get("players", {}).get(str(club_id), {})))
+
+
 def build_match_embed(club_id: int, platform: str, match: dict, match_type: str, club_name_hint: str | None = None):
     """
     Build a Discord embed for a match result with detailed stats.
@@ -99,10 +230,10 @@ def build_match_embed(club_id: int, platform: str, match: dict, match_type: str,
     # Get clubs data from new API structure
     clubs = match.get("clubs", {})
     
-    # Find our club and opponent
-    our_club = clubs.get(str(club_id), {})
-    opponent_ids = [cid for cid in clubs.keys() if str(cid) != str(club_id)]
-    opponent_club = clubs.get(opponent_ids[0], {}) if opponent_ids else {}
+    # Find our club and opponent (the first other club; EA keys clubs by string ID)
+    our_key = str(club_id)
+    our_club = clubs.get(our_key, {})
+    opponent_club = next((c for k, c in clubs.items() if k != our_key), {})
     
     # Get club names
     our_name = club_name_hint or our_club.get("details", {}).get("name", f"Club {club_id}")
@@ -113,16 +244,8 @@ def build_match_embed(club_id: int, platform: str, match: dict, match_type: str,
     opp_score = opponent_club.get("score", "?")
     
     # Determine result
-    match_res = interpret_match_result(our_club)
-    if match_res == "W":
-        res = "✅ Win"
-        color = 0x2ecc71  # Green
-    elif match_res == "L":
-        res = "❌ Loss"
-        color = 0xe74c3c  # Red
-    else:
-        res = "🤝 Draw"
-        color = 0xf1c40f  # Yellow
+    emoji, label, color = MATCH_RESULT_STYLE[interpret_match_result(our_club)]
+    res = f"{emoji} {label}"
     
     # Time
     when = utc_to_str(match.get("timestamp", 0))
@@ -138,88 +261,53 @@ def build_match_embed(club_id: int, platform: str, match: dict, match_type: str,
     if time_ago_str:
         desc_lines.append(f"🕐 {time_ago_str} ago")
     
-    embed = discord.Embed(
-        title=title,
-        description="\n".join(desc_lines),
-        color=color
-    )
-    
+    # Fields are collected as dicts and the embed is built in one
+    # Embed.from_dict call at the end, as in build_award_embed
+    fields = []
+
     # Get player stats from top-level players structure
-    all_players = match.get("players", {})
-    club_players = all_players.get(str(club_id), {})
+    club_players = match.get("players", {}).get(our_key, {})
     
     if club_players:
-        # Collect all player stats
-        player_stats = []
-        total_goals = 0
-        total_assists = 0
-        motm_player = None
-        
-        for player_id, player_data in club_players.items():
-            if isinstance(player_data, dict):
-                name = player_data.get("playername", "Unknown")
-                goals = int(player_data.get("goals", 0) or 0)
-                assists = int(player_data.get("assists", 0) or 0)
-                rating = float(player_data.get("rating", 0) or 0)
-                mom = int(player_data.get("mom", 0) or 0)
-                
-                total_goals += goals
-                total_assists += assists
-                
-                if mom == 1:
-                    motm_player = (name, rating)
-                
-                player_stats.append({
-                    "name": name,
-                    "goals": goals,
-                    "assists": assists,
-                    "rating": rating,
-                    "mom": mom
-                })
-        
+        players = tuple(_iter_players(club_players))
+        # EA flags one player per club with mom=1
+        motm_player = next((p for p in reversed(players) if p.mom == 1), None)
+
         # Sort by goals, then assists, then rating
-        player_stats.sort(key=lambda x: (x["goals"], x["assists"], x["rating"]), reverse=True)
+        player_stats = sorted(players, key=attrgetter("goals", "assists", "rating"), reverse=True)
 
         # Goal scorers (with assists inline)
-        scorers = [p for p in player_stats if p["goals"] > 0]
+        scorers = [p for p in player_stats if p.goals > 0]
         if scorers:
-            scorers_text = "\n".join([
-                f"⚽ **{p['name']}** {'x' + str(p['goals']) if p['goals'] > 1 else ''}"
-                + (f" (+{p['assists']}A)" if p['assists'] > 0 else "")
+            scorers_text = "\n".join(
+                f"⚽ **{p.name}** {_times(p.goals)}{f' (+{p.assists}A)' if p.assists > 0 else ''}"
                 for p in scorers
-            ])
-            embed.add_field(name="⚽ Goal Scorers", value=scorers_text, inline=False)
+            )
+            fields.append({"name": "⚽ Goal Scorers", "value": scorers_text, "inline": False})
 
         # Pure assisters (assisted but didn't score)
-        pure_assisters = [p for p in player_stats if p["assists"] > 0 and p["goals"] == 0]
+        pure_assisters = [p for p in player_stats if p.assists > 0 and p.goals == 0]
         if pure_assisters:
-            assist_text = "\n".join([
-                f"🅰️ **{p['name']}** {'x' + str(p['assists']) if p['assists'] > 1 else ''}"
-                for p in pure_assisters
-            ])
-            embed.add_field(name="🅰️ Assisters", value=assist_text, inline=False)
+            assist_text = "\n".join(f"🅰️ **{p.name}** {_times(p.assists)}" for p in pure_assisters)
+            fields.append({"name": "🅰️ Assisters", "value": assist_text, "inline": False})
 
         # Man of the Match
         if motm_player:
-            embed.add_field(
-                name="⭐ Man of the Match",
-                value=f"**{motm_player[0]}** ({motm_player[1]:.1f} rating)",
-                inline=False
-            )
+            fields.append({
+                "name": "⭐ Man of the Match",
+                "value": f"**{motm_player.name}** ({motm_player.rating:.1f} rating)",
+                "inline": False,
+            })
 
-        # All player ratings sorted desc
-        player_stats.sort(key=lambda x: x["rating"], reverse=True)
-        rated = [p for p in player_stats if p['rating'] > 0]
+        # All rated players by rating desc (ties keep the goals order above);
+        # unrated players are dropped before sorting rather than after
+        rated = sorted((p for p in player_stats if p.rating > 0), key=attrgetter("rating"), reverse=True)
         if rated:
-            ratings_text = "\n".join([
-                f"{'⭐' if p['mom'] == 1 else '·'} **{p['name']}** {p['rating']:.1f}"
-                for p in rated
-            ])
-            embed.add_field(name="📊 Player Ratings", value=ratings_text, inline=True)
+            ratings_text = "\n".join(f"{'⭐' if p.mom == 1 else '·'} **{p.name}** {p.rating:.1f}" for p in rated)
+            fields.append({"name": "📊 Player Ratings", "value": ratings_text, "inline": True})
         
         # Aggregate stats from match data
-        aggregate = match.get("aggregate", {})
-        our_aggregate = aggregate.get(str(club_id), {})
+        our_aggregate = match.get("aggregate", {}).get(our_key, {})
         
         if our_aggregate:
             # Calculate some team stats
@@ -230,13 +318,20 @@ def build_match_embed(club_id: int, platform: str, match: dict, match_type: str,
             shots = int(our_aggregate.get("shots", 0) or 0)
             tackles = int(our_aggregate.get("tacklesmade", 0) or 0)
             
-            team_stats_text = f"🎯 Pass: {pass_pct}% ({passes_made}/{pass_attempts})\n"
-            team_stats_text += f"🥅 Shots: {shots}\n"
-            team_stats_text += f"🛡️ Tackles: {tackles}"
+            team_stats_text = (
+                f"🎯 Pass: {pass_pct}% ({passes_made}/{pass_attempts})\n"
+                f"🥅 Shots: {shots}\n"
+                f"🛡️ Tackles: {tackles}"
+            )
             
-            embed.add_field(name="📈 Team Stats", value=team_stats_text, inline=True)
-    
-    embed.set_footer(text=f"Platform: {platform} | Match Type: {match_type}")
-    return embed
+            fields.append({"name": "📈 Team Stats", "value": team_stats_text, "inline": True})
+
+    return discord.Embed.from_dict({
+        "title": title,
+        "description": "\n".join(desc_lines),
+        "color": color,
+        "fields": fields,
+        "footer": {"text": f"Platform: {platform} | Match Type: {match_type}"},
+    })
 
 